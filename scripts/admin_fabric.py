@@ -4,35 +4,552 @@ Manages content (unlock/lock days, upload recordings) with Fabric backend
 Uses Service Principal authentication
 """
 
+# requests, azure.identity and python-dotenv are imported where they are first needed, so
+# --help and --offline commands don't pay for them
+from __future__ import annotations
+
+import argparse
 import os
 import json
-import requests
+import time
+import asyncio
+import copy
+import hashlib
+import random
+import re
+import tempfile
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
-from azure.identity import ClientSecretCredential, DefaultAzureCredential
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+if TYPE_CHECKING:
+    import requests
+
+STORAGE_SCOPE = "https://storage.azure.com/.default"
+
+# Cohort shards live under TrainingData/<course>/<cohort>/
+DEFAULT_COURSE = 'power-bi'
+SHARD_NAME_PATTERN = re.compile(r'^[A-Za-z0-9._-]+$')
+
+# Offline mode reads and writes the exported copies in data/ (data/<course>/<cohort>/ for a cohort)
+DEFAULT_DATA_DIR = 'data'
+
+# Append-only change log and the offset already folded into the snapshot files
+EVENT_LOG_FILE = 'changes.jsonl'
+EVENT_CHECKPOINT_FILE = 'changes_checkpoint.json'
+
+# OneLake append sizing for write_file()
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_APPEND_PARALLELISM = 4
+
+# Local recordings (platform LOCAL) are streamed by start_presentation.py from this URL path
+LOCAL_RECORDINGS_PATH = 'recordings/'
+LOCAL_VIDEO_SUFFIXES = ('.mp4', '.m4v', '.webm', '.ogv', '.mov')
+HOSTED_VIDEO_SITES = ('youtube.com/', 'youtu.be/', 'vimeo.com/', 'drive.google.com')
+
+
+_env_loaded = False
+
+
+def load_environment():
+    """Load .env into os.environ once (skipped when python-dotenv isn't installed)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+class TokenCache:
+    """Caches an AccessToken and refreshes it in the background before expiry"""
+    
+    def __init__(self, credential=None, scope: str = STORAGE_SCOPE,
+                 expiry_margin: int = 300, refresh_margin: int = 600, credential_factory=None):
+        """
+        credential_factory: called for the credential on the first fetch when none is given,
+                            so nothing authenticates until a token is actually needed
+        expiry_margin: seconds before expires_on after which a cached token is no longer handed out
+        refresh_margin: seconds before expires_on at which a background refresh is started
+        """
+        self.credential = credential
+        self.credential_factory = credential_factory
+        self.scope = scope
+        self.expiry_margin = expiry_margin
+        self.refresh_margin = max(refresh_margin, expiry_margin)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._token = None
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+    
+    def get_token(self) -> str:
+        """Return a valid bearer token, fetching a new one only when the cached one is stale"""
+        with self._lock:
+            if self._is_fresh(self._token):
+                self.hits += 1
+                return self._token.token
+            self.misses += 1
+            return self._fetch().token
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters for diagnostics"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'hitRatio': round(self.hits / total, 3) if total else 0.0,
+            'expiresOn': self._token.expires_on if self._token else None
+        }
+    
+    def close(self):
+        """Cancel any pending background refresh"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+    
+    def _is_fresh(self, token) -> bool:
+        return token is not None and token.expires_on - self.expiry_margin > time.time()
+    
+    def _fetch(self):
+        """Fetch a token from the credential and schedule its refresh (caller holds the lock)"""
+        if self.credential is None:
+            self.credential = self.credential_factory()
+        self._store(self.credential.get_token(self.scope))
+        return self._token
+    
+    def _store(self, token):
+        """Keep the token that lives longest and schedule its refresh (caller holds the lock)"""
+        if self._token is None or token.expires_on >= self._token.expires_on:
+            self._token = token
+            self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        delay = self._token.expires_on - self.refresh_margin - time.time()
+        if delay <= 0:
+            # Token is too short-lived to refresh ahead of time; get_token() handles it
+            return
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _background_refresh(self):
+        # Fetch outside the lock: get_token() keeps handing out the still-valid cached token meanwhile
+        try:
+            with self._lock:
+                credential = self.credential
+            token = credential.get_token(self.scope)
+            with self._lock:
+                self._store(token)
+                self.refreshes += 1
+        except Exception as e:
+            # The next get_token() call will retry in the foreground
+            print(f"⚠️ Background token refresh failed: {e}")
+
+
+def create_session(pool_size: int = 10, max_retries: int = 5,
+                   backoff_factor: float = 0.5) -> requests.Session:
+    """Create a pooled keep-alive session that retries throttled (429/503) requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(
+        total=max_retries,
+        status_forcelist=(429, 503),
+        # OneLake DFS writes are positional (create/append/flush), so replaying them is safe
+        allowed_methods=frozenset(['GET', 'HEAD', 'PUT', 'PATCH', 'DELETE']),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide session so every client reuses the same connection pool"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session(
+                pool_size=int(os.getenv('FABRIC_HTTP_POOL_SIZE', '10')),
+                max_retries=int(os.getenv('FABRIC_HTTP_MAX_RETRIES', '5')),
+                backoff_factor=float(os.getenv('FABRIC_HTTP_BACKOFF', '0.5'))
+            )
+        return _shared_session
+
+
+class WriteConflict(Exception):
+    """A conditional OneLake write lost the race with another writer (HTTP 412/409)"""
+
+
+class UnreadableSnapshot(Exception):
+    """A JSON file exists but its body doesn't parse (e.g. a write died between create and flush)
+    
+    Carries the ETag it was read at, so the next write can overwrite exactly that version.
+    """
+    
+    def __init__(self, file_path: str, etag: Optional[str]):
+        super().__init__(f"{file_path} exists but is not valid JSON")
+        self.etag = etag
+
+
+class AuthenticationError(Exception):
+    """No access token could be obtained (raised on the first remote call, not at construction)"""
+
+
+class JsonFileCache:
+    """On-disk cache of OneLake JSON files with the validators needed to revalidate them"""
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _paths(self, url: str):
+        name = url.rsplit('/', 1)[-1]
+        key = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}_{name}"
+        base = os.path.join(self.cache_dir, key)
+        return base, base + '.meta.json'
+    
+    def load(self, url: str) -> Optional[Dict]:
+        """Return {'body', 'etag', 'lastModified'} for a cached URL, or None"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['body'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+    
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """Store a body and its validators (atomically, so readers never see a torn file)"""
+        body_path, meta_path = self._paths(url)
+        self._write_atomic(body_path, body)
+        self._write_meta(url, meta_path, etag, last_modified)
+    
+    def open_body(self, url: str):
+        """Temp file to stream a body into (and read back); pass it to store_file() once the validators are known"""
+        body_path, _ = self._paths(url)
+        return open(f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp", 'w+b')
+    
+    def store_file(self, url: str, body_file, etag: Optional[str], last_modified: Optional[str]):
+        """Store a body written through open_body() (moved into place, never read back into memory)"""
+        body_path, meta_path = self._paths(url)
+        body_file.close()
+        os.replace(body_file.name, body_path)
+        self._write_meta(url, meta_path, etag, last_modified)
+    
+    @staticmethod
+    def discard_body(body_file):
+        body_file.close()
+        try:
+            os.remove(body_file.name)
+        except OSError:
+            pass
+    
+    def _write_meta(self, url: str, meta_path: str, etag: Optional[str], last_modified: Optional[str]):
+        meta = {'url': url, 'etag': etag, 'lastModified': last_modified,
+                'cachedAt': datetime.utcnow().isoformat() + 'Z'}
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+    
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class _Record:
+    """Base for __slots__ records that round-trip their JSON dict (unknown keys included)"""
+    
+    __slots__ = ('extra', '_keys')
+    
+    # (json key, attribute, default) for the fields the client reads and writes
+    FIELDS = ()
+    
+    def __init__(self, **values):
+        for key, attr, default in self.FIELDS:
+            setattr(self, attr, values.get(attr, default))
+        self.extra = {}
+        self._keys = tuple(key for key, _, _ in self.FIELDS)
+    
+    @classmethod
+    def from_dict(cls, data: Dict):
+        record = cls.__new__(cls)
+        known = set()
+        for key, attr, default in cls.FIELDS:
+            setattr(record, attr, data.get(key, default))
+            known.add(key)
+        record.extra = {k: v for k, v in data.items() if k not in known}
+        # Remember the original key order so rewritten files diff cleanly
+        record._keys = tuple(data) + tuple(k for k, _, _ in cls.FIELDS if k not in data)
+        return record
+    
+    def to_dict(self) -> Dict:
+        attrs = {key: attr for key, attr, _ in self.FIELDS}
+        return {
+            key: getattr(self, attrs[key]) if key in attrs else self.extra[key]
+            for key in self._keys
+        }
+
+
+class TrainingDay(_Record):
+    """One training day"""
+    
+    __slots__ = ('day_number', 'title', 'is_unlocked', 'unlocked_at', 'unlocked_by')
+    
+    FIELDS = (
+        ('dayNumber', 'day_number', None),
+        ('title', 'title', ''),
+        ('isUnlocked', 'is_unlocked', False),
+        ('unlockedAt', 'unlocked_at', None),
+        ('unlockedBy', 'unlocked_by', None)
+    )
+
+
+class Recording(_Record):
+    """One session recording"""
+    
+    __slots__ = ('recording_id', 'day_number', 'title', 'video_url', 'embed_url', 'platform',
+                 'duration', 'uploaded_at', 'uploaded_by', 'view_count', 'is_active')
+    
+    FIELDS = (
+        ('recordingId', 'recording_id', None),
+        ('dayNumber', 'day_number', None),
+        ('title', 'title', ''),
+        ('videoUrl', 'video_url', ''),
+        ('embedUrl', 'embed_url', ''),
+        ('platform', 'platform', 'YOUTUBE'),
+        ('duration', 'duration', ''),
+        ('uploadedAt', 'uploaded_at', None),
+        ('uploadedBy', 'uploaded_by', None),
+        ('viewCount', 'view_count', 0),
+        ('isActive', 'is_active', True)
+    )
+
+
+class TrainingStore:
+    """Days and recordings indexed by dayNumber/recordingId, with running counters
+    
+    Lookups, mutations and stats are O(1); the JSON lists are only rebuilt on save.
+    """
+    
+    def __init__(self, days: Optional[List[Dict]] = None, recordings: Optional[List[Dict]] = None):
+        self.days: Dict[int, TrainingDay] = {}
+        self.recordings: Dict[str, Recording] = {}
+        self._recordings_by_day: Dict[int, List[str]] = {}
+        self.unlocked_count = 0
+        
+        # A repeated dayNumber keeps its last record, so count from the index, not the input
+        for data in days or []:
+            day = TrainingDay.from_dict(data)
+            self.days[day.day_number] = day
+        self.unlocked_count = sum(1 for day in self.days.values() if day.is_unlocked)
+        for data in recordings or []:
+            self._add_recording(Recording.from_dict(data))
+    
+    # ----- Lookups -----
+    
+    def day(self, day_number: int) -> Optional[TrainingDay]:
+        return self.days.get(day_number)
+    
+    def recordings_for_day(self, day_number: int) -> List[Recording]:
+        return [self.recordings[rid] for rid in self._recordings_by_day.get(day_number, [])]
+    
+    @property
+    def locked_count(self) -> int:
+        return len(self.days) - self.unlocked_count
+    
+    # ----- Mutations -----
+    
+    def set_unlocked(self, day_number: int, unlocked: bool, at: Optional[str] = None,
+                     by: Optional[str] = None) -> bool:
+        """Lock or unlock a day; returns False if the day doesn't exist"""
+        day = self.days.get(day_number)
+        if day is None:
+            return False
+        self.unlocked_count += int(unlocked) - int(bool(day.is_unlocked))
+        day.is_unlocked = unlocked
+        day.unlocked_at = at if unlocked else None
+        day.unlocked_by = by if unlocked else None
+        return True
+    
+    def unlock_all(self, at: str, by: str):
+        for day_number in self.days:
+            self.set_unlocked(day_number, True, at, by)
+    
+    def replace_recording(self, recording: Recording):
+        """Make `recording` the only recording for its day"""
+        self.remove_recordings_for_day(recording.day_number)
+        self._add_recording(recording)
+    
+    def remove_recordings_for_day(self, day_number: int) -> int:
+        removed = self._recordings_by_day.pop(day_number, [])
+        for rid in removed:
+            del self.recordings[rid]
+        return len(removed)
+    
+    def _add_recording(self, recording: Recording):
+        previous = self.recordings.get(recording.recording_id)
+        if previous is not None:
+            self._recordings_by_day[previous.day_number].remove(recording.recording_id)
+        self.recordings[recording.recording_id] = recording
+        self._recordings_by_day.setdefault(recording.day_number, []).append(recording.recording_id)
+    
+    # ----- Serialization & stats -----
+    
+    def days_json(self) -> List[Dict]:
+        return [day.to_dict() for day in self.days.values()]
+    
+    def recordings_json(self) -> List[Dict]:
+        return [recording.to_dict() for recording in self.recordings.values()]
+    
+    def stats(self) -> Dict:
+        return {
+            'totalDays': len(self.days),
+            'unlockedDays': self.unlocked_count,
+            'lockedDays': self.locked_count,
+            'recordingsAvailable': len(self.recordings),
+            'lastUpdated': datetime.utcnow().isoformat() + 'Z'
+        }
 
-# Load environment variables
-load_dotenv()
 
 class FabricAdminClient:
     """Admin client for managing training content in Microsoft Fabric"""
     
-    def __init__(self):
-        """Initialize with Service Principal or Default credentials"""
+    def __init__(self, session: Optional[requests.Session] = None, cache_dir: Optional[str] = None,
+                 event_log: Optional[bool] = None, course: Optional[str] = None,
+                 cohort: Optional[str] = None, offline: Optional[bool] = None,
+                 data_dir: Optional[str] = None):
+        """Initialize with Service Principal or Default credentials (authenticates on the first remote call)
+        
+        course/cohort: operate on one cohort's shard, TrainingData/<course>/<cohort>/
+                       (defaults to FABRIC_COURSE/FABRIC_COHORT; no cohort = the shared root files)
+        cache_dir: where downloaded JSON files are cached for ETag revalidation
+                   (defaults to FABRIC_CACHE_DIR; set it to an empty string to disable)
+        event_log: append changes to changes.jsonl instead of rewriting the snapshot files
+                   (defaults to FABRIC_EVENT_LOG)
+        offline: read and write the local JSON files under data_dir instead of OneLake
+                 (defaults to FABRIC_OFFLINE; data_dir defaults to data/)
+        """
+        load_environment()
+        self.offline = offline if offline is not None else \
+            os.getenv('FABRIC_OFFLINE', '').lower() in ('1', 'true', 'yes')
+        self.data_dir = data_dir or DEFAULT_DATA_DIR
+        
         self.workspace_id = os.getenv('FABRIC_WORKSPACE_ID', 'aa2e4642-108a-4ce5-a99f-9ad4c87856bc')
         self.lakehouse_id = os.getenv('FABRIC_LAKEHOUSE_ID', '9a01978a-106f-42bd-b114-913e4f7c29c2')
         self.workspace_name = 'MS-Fabric-Learn'
         self.lakehouse_name = 'Learning_LH'
         
-        # OneLake REST API base URL
-        self.onelake_base = f"https://onelake.dfs.fabric.microsoft.com/{self.workspace_name}/{self.lakehouse_name}.Lakehouse/Files/TrainingData"
+        # OneLake REST API base URLs: the training data root and this client's shard of it
+        self.onelake_root = f"https://onelake.dfs.fabric.microsoft.com/{self.workspace_name}/{self.lakehouse_name}.Lakehouse/Files/TrainingData"
+        self._set_shard(course or os.getenv('FABRIC_COURSE') or DEFAULT_COURSE,
+                        cohort or os.getenv('FABRIC_COHORT') or None)
+        
+        # Pooled keep-alive transport shared by every operation (created on first use)
+        self._session = session
+        
+        # Local read-through cache, revalidated with If-None-Match
+        if cache_dir is None:
+            cache_dir = os.getenv('FABRIC_CACHE_DIR', '~/.cache/powerbi-training/onelake')
+        self.cache = JsonFileCache(cache_dir) if cache_dir and not self.offline else None
+        
+        # Attempts for a read-modify-write before giving up on concurrent writers
+        self.max_write_attempts = int(os.getenv('FABRIC_WRITE_ATTEMPTS', '5'))
+        
+        # Append-only change log, folded into the snapshots once it grows past the threshold
+        if event_log is None:
+            event_log = os.getenv('FABRIC_EVENT_LOG', '').lower() in ('1', 'true', 'yes')
+        # The change log only exists in OneLake; offline edits go straight to the local snapshots
+        self.event_log = event_log and not self.offline
+        self.compact_threshold = int(os.getenv('FABRIC_COMPACT_THRESHOLD_BYTES', str(64 * 1024)))
         
-        # Initialize authentication
-        self._setup_auth()
+        # Authentication is deferred to the first token request, so local commands never sign in
+        self.credential = None
+        self.token_cache = TokenCache(credential_factory=self._setup_auth)
+    
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = get_shared_session()
+        return self._session
+    
+    @property
+    def local_dir(self) -> str:
+        """Folder of this shard's JSON files in offline mode (the same layout `export` writes)"""
+        if self.cohort:
+            return os.path.join(self.data_dir, self.course, self.cohort)
+        return self.data_dir
         
+    def _set_shard(self, course: str, cohort: Optional[str]):
+        for name in (course, cohort):
+            if name is not None and not SHARD_NAME_PATTERN.match(name):
+                raise ValueError(f"Invalid course/cohort name: {name!r} (use letters, digits, '.', '_' or '-')")
+        self.course = course
+        self.cohort = cohort
+        if cohort:
+            self.onelake_base = f"{self.onelake_root}/{course}/{cohort}"
+        else:
+            self.onelake_base = self.onelake_root
+    
+    def for_cohort(self, cohort: str, course: Optional[str] = None) -> 'FabricAdminClient':
+        """Client for another cohort that shares this one's credentials, session and cache"""
+        client = copy.copy(self)
+        client._set_shard(course or self.course, cohort)
+        return client
+    
+    def list_cohorts(self, course: Optional[str] = None) -> List[str]:
+        """Names of the cohort folders stored for a course"""
+        course = course or self.course
+        if self.offline:
+            course_dir = os.path.join(self.data_dir, course)
+            if not os.path.isdir(course_dir):
+                return []
+            return sorted(name for name in os.listdir(course_dir)
+                          if os.path.isdir(os.path.join(course_dir, name)))
+        directory = f"{self.lakehouse_name}.Lakehouse/Files/TrainingData/{course}"
+        url = (f"https://onelake.dfs.fabric.microsoft.com/{self.workspace_name}"
+               f"?resource=filesystem&recursive=false&directory={quote(directory)}")
+        response = self._make_request('GET', url)
+        if response.status_code == 404:
+            return []
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to list cohorts: {response.status_code} - {response.text}")
+        return sorted(
+            path['name'].rsplit('/', 1)[-1]
+            for path in response.json().get('paths', [])
+            if str(path.get('isDirectory', '')).lower() == 'true'
+        )
+    
     def _setup_auth(self):
-        """Setup Azure authentication"""
+        """Create the Azure credential; the token cache calls this on the first remote call"""
+        from azure.identity import ClientSecretCredential, DefaultAzureCredential
+        
         try:
             # Try Service Principal first (for GitHub Actions)
             if all([os.getenv('AZURE_CLIENT_ID'), 
@@ -48,23 +565,23 @@ class FabricAdminClient:
                 # Fallback to default (Azure CLI, Managed Identity, etc.)
                 print("Using Default Azure credentials")
                 self.credential = DefaultAzureCredential()
-            
-            # Get initial token to verify auth
-            self._get_token()
-            print("Authentication successful")
+            return self.credential
             
         except Exception as e:
             print(f"Authentication failed: {e}")
             raise
     
     def _get_token(self) -> str:
-        """Get access token for Fabric API"""
-        scope = "https://storage.azure.com/.default"
-        token = self.credential.get_token(scope)
-        return token.token
+        """Get access token for Fabric API (cached until shortly before expiry)"""
+        try:
+            return self.token_cache.get_token()
+        except Exception as e:
+            raise AuthenticationError(f"Authentication failed: {e}") from e
     
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make authenticated request to OneLake API"""
+        if self.offline:
+            raise RuntimeError("This operation needs OneLake and isn't available with --offline")
         token = self._get_token()
         headers = kwargs.pop('headers', {})
         headers.update({
@@ -72,39 +589,253 @@ class FabricAdminClient:
             'x-ms-version': '2023-11-03'
         })
         
-        response = requests.request(method, url, headers=headers, **kwargs)
+        response = self.session.request(method, url, headers=headers, **kwargs)
         return response
     
+    def _fetch_json(self, file_path: str):
+        """GET a JSON file, revalidating the local copy so unchanged files cost a bodyless 304
+        
+        Returns (status_code, data, etag); data is None unless the file was loaded.
+        Raises UnreadableSnapshot when the file exists but doesn't parse.
+        """
+        if self.offline:
+            try:
+                with open(os.path.join(self.local_dir, file_path), encoding='utf-8') as f:
+                    return 200, json.load(f), None
+            except FileNotFoundError:
+                return 404, None, None
+            except ValueError:
+                raise UnreadableSnapshot(file_path, None)
+        
+        url = f"{self.onelake_base}/{file_path}"
+        cached = self.cache.load(url) if self.cache else None
+        if cached:
+            # A corrupt cached body is dropped, so the GET below fetches the file in full
+            try:
+                cached['data'] = json.loads(cached['body'])
+            except ValueError:
+                cached = None
+        
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('lastModified'):
+                headers['If-Modified-Since'] = cached['lastModified']
+        
+        response = self._make_request('GET', url, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            return 200, cached['data'], response.headers.get('ETag') or cached.get('etag')
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            try:
+                data = json.loads(response.content)
+            except ValueError:
+                raise UnreadableSnapshot(file_path, etag)
+            if self.cache:
+                self.cache.store(url, response.content, etag, response.headers.get('Last-Modified'))
+            return 200, data, etag
+        return response.status_code, None, None
+    
+    @staticmethod
+    def _condition_headers(etag: Optional[str], conditional: bool) -> Dict:
+        """If-Match for a file read at `etag`; If-None-Match: * for one that didn't exist"""
+        if not conditional:
+            return {}
+        if etag:
+            return {'If-Match': etag}
+        return {'If-None-Match': '*'}
+    
+    def _remember_write(self, file_path: str, body_file, response: requests.Response):
+        """Seed the cache with what we just wrote (streamed into body_file) so the next read is a 304"""
+        self.cache.store_file(f"{self.onelake_base}/{file_path}", body_file,
+                              response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    
+    # ========== OneLake File Writes ==========
+    
+    def write_file(self, file_path: str, source, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   etag: Optional[str] = None, conditional: bool = False,
+                   content_type: str = 'application/octet-stream',
+                   max_parallel: int = DEFAULT_APPEND_PARALLELISM) -> Optional[requests.Response]:
+        """Write a file to OneLake with the DFS create/append/flush protocol
+        
+        source may be bytes, str, a binary/text file object or an iterable of chunks; it is
+        read incrementally, so only about max_parallel chunks are held in memory at once.
+        Each chunk is appended at its precomputed offset from a small thread pool, then the
+        file is flushed once. With conditional=True the create is guarded by
+        If-Match/If-None-Match and WriteConflict is raised if another writer got there first.
+        
+        Returns the flush response on success, None on failure.
+        """
+        try:
+            # Step 1: Create/Open the file
+            create_url = f"{self.onelake_base}/{file_path}?resource=file"
+            create_response = self._make_request('PUT', create_url,
+                                                 headers=self._condition_headers(etag, conditional))
+            
+            if conditional and create_response.status_code in [409, 412]:
+                raise WriteConflict(file_path)
+            if create_response.status_code not in [200, 201]:
+                print(f"Error creating file: {create_response.status_code} - {create_response.text}")
+                return None
+            
+            # Step 2: Append chunks in parallel at their offsets
+            position = 0
+            in_flight = threading.BoundedSemaphore(max_parallel * 2)
+            futures = []
+            with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+                for chunk in self._iter_chunks(source, chunk_size):
+                    in_flight.acquire()
+                    future = pool.submit(self._append_chunk, file_path, position, chunk, content_type)
+                    future.add_done_callback(lambda _: in_flight.release())
+                    futures.append(future)
+                    position += len(chunk)
+            
+            for future in futures:
+                append_response = future.result()
+                if append_response.status_code not in [200, 202]:
+                    print(f"Error appending content: {append_response.status_code} - {append_response.text}")
+                    return None
+            
+            # Step 3: Flush to finalize
+            flush_url = f"{self.onelake_base}/{file_path}?action=flush&position={position}"
+            flush_response = self._make_request('PATCH', flush_url)
+            
+            if flush_response.status_code not in [200, 201]:
+                print(f"Error flushing file: {flush_response.status_code} - {flush_response.text}")
+                return None
+            
+            return flush_response
+            
+        except WriteConflict:
+            raise
+        except Exception as e:
+            print(f"Error writing {file_path}: {e}")
+            return None
+    
+    def _append_chunk(self, file_path: str, position: int, chunk: bytes, content_type: str,
+                      headers: Optional[Dict] = None) -> requests.Response:
+        append_url = f"{self.onelake_base}/{file_path}?action=append&position={position}"
+        headers = dict(headers or {}, **{'Content-Type': content_type})
+        return self._make_request('PATCH', append_url, headers=headers, data=chunk)
+    
+    @staticmethod
+    def _iter_chunks(source, chunk_size: int):
+        """Re-chunk bytes/str/file objects/iterables into pieces of exactly chunk_size bytes"""
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = memoryview(source)
+            for start in range(0, len(source), chunk_size):
+                yield bytes(source[start:start + chunk_size])
+            return
+        
+        if hasattr(source, 'read'):
+            pieces = iter(lambda: source.read(chunk_size), source.read(0))
+        else:
+            pieces = iter(source)
+        
+        buffer = bytearray()
+        for piece in pieces:
+            buffer += piece.encode('utf-8') if isinstance(piece, str) else piece
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        if buffer:
+            yield bytes(buffer)
+    
+    def _save_json(self, file_path: str, data, etag: Optional[str] = None, conditional: bool = False,
+                   indent: Optional[int] = None) -> bool:
+        """Serialize data to a temp file, then stream it into write_file (compact unless indent is given)
+        
+        The whole payload is encoded before the create, which truncates the remote file, so a
+        serialization error can't leave an empty snapshot behind.
+        """
+        if self.offline:
+            # Same formatting as `export`, so the local files stay diff-friendly
+            path = os.path.join(self.local_dir, file_path)
+            os.makedirs(self.local_dir, exist_ok=True)
+            JsonFileCache._write_atomic(path, json.dumps(data, indent=2).encode('utf-8'))
+            return True
+        
+        separators = None if indent is not None else (',', ':')
+        encoded = json.JSONEncoder(indent=indent, separators=separators).iterencode(data)
+        
+        # Encode into the read cache's temp file (it seeds the cache after the flush), or a spooled
+        # temp file without a cache, rather than holding the body in memory
+        if self.cache:
+            body_file = self.cache.open_body(f"{self.onelake_base}/{file_path}")
+        else:
+            body_file = tempfile.SpooledTemporaryFile(max_size=DEFAULT_CHUNK_SIZE)
+        try:
+            for piece in encoded:
+                body_file.write(piece.encode('utf-8'))
+            body_file.seek(0)
+            flush_response = self.write_file(file_path, body_file, etag=etag, conditional=conditional,
+                                             content_type='application/json')
+        except BaseException:
+            self._discard_body(body_file)
+            raise
+        if flush_response is None:
+            self._discard_body(body_file)
+            return False
+        if self.cache:
+            self._remember_write(file_path, body_file, flush_response)
+        else:
+            body_file.close()
+        return True
+    
+    def _discard_body(self, body_file):
+        if self.cache:
+            self.cache.discard_body(body_file)
+        else:
+            body_file.close()
+    
     # ========== Training Days Operations ==========
     
+    def load_store(self, days: bool = True, recordings: bool = True) -> TrainingStore:
+        """Load days and/or recordings (plus any logged changes) into an indexed store"""
+        store = TrainingStore(self._load_days()[0] if days else None,
+                              self._load_recordings()[0] if recordings else None)
+        if self.event_log:
+            self._replay_events(store, days=days, recordings=recordings)
+        return store
+    
     def get_all_days(self) -> List[Dict]:
         """Get all training days from Fabric"""
+        return self.load_store(recordings=False).days_json()
+    
+    def _load_days(self, for_write: bool = False):
+        """Load training days together with the ETag they were read at (None if the file doesn't exist)
+        
+        Falls back to the default days if the file is missing or unreadable. With for_write, any
+        other read failure raises instead, so defaults are never written over a file we couldn't read.
+        """
         try:
-            url = f"{self.onelake_base}/training_days.json"
-            response = self._make_request('GET', url)
+            status, days, etag = self._fetch_json('training_days.json')
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"⚠️ Failed to load days: {response.status_code}")
-                return self._get_default_days()
+            if status == 200:
+                return days, etag
+            if for_write and status != 404:
+                raise RuntimeError(f"Could not read training_days.json: {status}")
+            print(f"⚠️ Failed to load days: {status}")
+            return self._get_default_days(), None
+        except UnreadableSnapshot as e:
+            print(f"⚠️ {e}, starting from the default days")
+            return self._get_default_days(), e.etag
+        except AuthenticationError:
+            raise
         except Exception as e:
+            if for_write:
+                raise
             print(f"❌ Error loading days: {e}")
-            return self._get_default_days()
+            return self._get_default_days(), None
     
     def unlock_day(self, day_number: int, unlocked_by: str = 'admin') -> bool:
         """Unlock a training day"""
         try:
-            days = self.get_all_days()
-            
-            for day in days:
-                if day['dayNumber'] == day_number:
-                    day['isUnlocked'] = True
-                    day['unlockedAt'] = datetime.utcnow().isoformat() + 'Z'
-                    day['unlockedBy'] = unlocked_by
-                    break
-            
-            success = self._save_days(days)
+            success = self.apply_changes([self._unlock_change(day_number, unlocked_by)])
             if success:
                 print(f"Day {day_number} unlocked successfully")
             return success
@@ -116,16 +847,7 @@ class FabricAdminClient:
     def lock_day(self, day_number: int) -> bool:
         """Lock a training day"""
         try:
-            days = self.get_all_days()
-            
-            for day in days:
-                if day['dayNumber'] == day_number:
-                    day['isUnlocked'] = False
-                    day['unlockedAt'] = None
-                    day['unlockedBy'] = None
-                    break
-            
-            success = self._save_days(days)
+            success = self.apply_changes([self._lock_change(day_number)])
             if success:
                 print(f"Day {day_number} locked successfully")
             return success
@@ -137,110 +859,52 @@ class FabricAdminClient:
     def unlock_all_days(self, unlocked_by: str = 'admin') -> bool:
         """Unlock all training days"""
         try:
-            days = self.get_all_days()
-            timestamp = datetime.utcnow().isoformat() + 'Z'
-            
-            for day in days:
-                day['isUnlocked'] = True
-                day['unlockedAt'] = timestamp
-                day['unlockedBy'] = unlocked_by
-            
-            success = self._save_days(days)
+            success = self.apply_changes([self._unlock_all_change(unlocked_by)])
             if success:
-                print(f"✅ All {len(days)} days unlocked successfully")
+                print("✅ All days unlocked successfully")
             return success
             
         except Exception as e:
             print(f"❌ Error unlocking all days: {e}")
             return False
     
-    def _save_days(self, days: List[Dict]) -> bool:
-        """Save training days to Fabric using OneLake DFS API"""
-        try:
-            file_path = "training_days.json"
-            content = json.dumps(days, indent=2)
-            content_bytes = content.encode('utf-8')
-            content_length = len(content_bytes)
-            
-            # Step 1: Create/Open the file
-            create_url = f"{self.onelake_base}/{file_path}?resource=file"
-            create_response = self._make_request('PUT', create_url)
-            
-            if create_response.status_code not in [200, 201]:
-                print(f"Error creating file: {create_response.status_code} - {create_response.text}")
-                return False
-            
-            # Step 2: Append content
-            append_url = f"{self.onelake_base}/{file_path}?action=append&position=0"
-            append_response = self._make_request(
-                'PATCH',
-                append_url,
-                headers={'Content-Type': 'application/json'},
-                data=content_bytes
-            )
-            
-            if append_response.status_code not in [200, 202]:
-                print(f"Error appending content: {append_response.status_code} - {append_response.text}")
-                return False
-            
-            # Step 3: Flush to finalize
-            flush_url = f"{self.onelake_base}/{file_path}?action=flush&position={content_length}"
-            flush_response = self._make_request('PATCH', flush_url)
-            
-            if flush_response.status_code not in [200, 201]:
-                print(f"Error flushing file: {flush_response.status_code} - {flush_response.text}")
-                return False
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error saving days: {e}")
-            return False
-    
     # ========== Recording Operations ==========
     
     def get_all_recordings(self) -> List[Dict]:
         """Get all recordings from Fabric"""
+        return self.load_store(days=False).recordings_json()
+    
+    def _load_recordings(self, for_write: bool = False):
+        """Load recordings together with the ETag they were read at (None if the file doesn't exist)
+        
+        Same fallbacks as _load_days, starting from no recordings.
+        """
         try:
-            url = f"{self.onelake_base}/recordings.json"
-            response = self._make_request('GET', url)
+            status, recordings, etag = self._fetch_json('recordings.json')
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
+            if status == 200:
+                return recordings, etag
+            if for_write and status != 404:
+                raise RuntimeError(f"Could not read recordings.json: {status}")
+            return [], None
+        except UnreadableSnapshot as e:
+            print(f"⚠️ {e}, starting from no recordings")
+            return [], e.etag
+        except AuthenticationError:
+            raise
         except Exception as e:
+            if for_write:
+                raise
             print(f"❌ Error loading recordings: {e}")
-            return []
+            return [], None
     
     def upload_recording(self, day_number: int, title: str, video_url: str, 
-                        duration: str, platform: str = 'YOUTUBE',
+                        duration: str, platform: Optional[str] = None,
                         uploaded_by: str = 'admin') -> bool:
         """Upload a session recording"""
         try:
-            recordings = self.get_all_recordings()
-            
-            # Remove old recording for this day
-            recordings = [r for r in recordings if r['dayNumber'] != day_number]
-            
-            # Create new recording
-            new_recording = {
-                'recordingId': self._generate_uuid(),
-                'dayNumber': day_number,
-                'title': title,
-                'videoUrl': video_url,
-                'embedUrl': self._generate_embed_url(video_url),
-                'platform': platform,
-                'duration': duration,
-                'uploadedAt': datetime.utcnow().isoformat() + 'Z',
-                'uploadedBy': uploaded_by,
-                'viewCount': 0,
-                'isActive': True
-            }
-            
-            recordings.append(new_recording)
-            
-            success = self._save_recordings(recordings)
+            change = self._upload_change(day_number, title, video_url, duration, platform, uploaded_by)
+            success = self.apply_changes([change])
             if success:
                 print(f"✅ Recording uploaded for Day {day_number}")
             return success
@@ -252,12 +916,7 @@ class FabricAdminClient:
     def remove_recording(self, day_number: int) -> bool:
         """Remove recording for a specific day"""
         try:
-            recordings = self.get_all_recordings()
-            
-            # Remove recording for this day
-            recordings = [r for r in recordings if r['dayNumber'] != day_number]
-            
-            success = self._save_recordings(recordings)
+            success = self.apply_changes([self._remove_change(day_number)])
             if success:
                 print(f"🗑️ Recording removed for Day {day_number}")
             return success
@@ -266,47 +925,307 @@ class FabricAdminClient:
             print(f"❌ Error removing recording: {e}")
             return False
     
-    def _save_recordings(self, recordings: List[Dict]) -> bool:
-        """Save recordings to Fabric using OneLake DFS API"""
-        try:
-            file_path = "recordings.json"
-            content = json.dumps(recordings, indent=2)
-            content_bytes = content.encode('utf-8')
-            content_length = len(content_bytes)
+    # ========== Batched Changes ==========
+    
+    def batch(self) -> 'ChangeBatch':
+        """Start a batch of changes that is applied with a single read and write per file"""
+        return ChangeBatch(self)
+    
+    def apply_changes(self, changes: List[Dict]) -> bool:
+        """Apply a list of change records: load each affected file once, edit in memory, write once
+        
+        Change records look like {'action': 'unlock', 'dayNumber': 3, 'unlockedBy': 'admin'};
+        see ChangeBatch for the supported actions.
+        """
+        for change in changes:
+            error = self._change_error(change)
+            if error:
+                raise ValueError(error)
+        
+        if self.event_log:
+            return self._append_events(changes)
+        return self._apply_to_snapshots(changes)
+    
+    def _apply_to_snapshots(self, changes: List[Dict]) -> bool:
+        """Read-modify-write the snapshot files with the given change records"""
+        touches_days = any(CHANGE_ACTIONS[c['action']] == 'days' for c in changes)
+        touches_recordings = any(CHANGE_ACTIONS[c['action']] == 'recordings' for c in changes)
+        
+        # Optimistic concurrency: write only if nobody changed the file since we read it,
+        # otherwise re-read and re-apply. Change records carry their own timestamps and ids,
+        # so re-applying them (even over a file we already wrote) is idempotent.
+        for attempt in range(1, self.max_write_attempts + 1):
+            days, days_etag = self._load_days(for_write=True) if touches_days else (None, None)
+            recordings, recordings_etag = (self._load_recordings(for_write=True) if touches_recordings
+                                           else (None, None))
             
-            # Step 1: Create/Open the file
-            create_url = f"{self.onelake_base}/{file_path}?resource=file"
-            create_response = self._make_request('PUT', create_url)
+            store = TrainingStore(days, recordings)
+            for change in changes:
+                self._apply_change(store, change)
             
-            if create_response.status_code not in [200, 201]:
-                print(f"Error creating file: {create_response.status_code} - {create_response.text}")
+            try:
+                if touches_days and not self._save_json('training_days.json', store.days_json(),
+                                                        days_etag, conditional=True):
+                    return False
+                if touches_recordings and not self._save_json('recordings.json', store.recordings_json(),
+                                                              recordings_etag, conditional=True):
+                    return False
+                return True
+            except WriteConflict as e:
+                print(f"⚠️ {e} changed since it was read, retrying ({attempt}/{self.max_write_attempts})")
+                time.sleep(random.uniform(0, 0.2 * attempt))
+        
+        print(f"❌ Gave up after {self.max_write_attempts} conflicting writes")
+        return False
+    
+    def _apply_change(self, store: TrainingStore, change: Dict):
+        """Apply one change record to the store"""
+        action = change['action']
+        
+        if action == 'unlock':
+            if not store.set_unlocked(change['dayNumber'], True, change['at'], change.get('unlockedBy', 'admin')):
+                print(f"⚠️ Day {change['dayNumber']} not found")
+        
+        elif action == 'lock':
+            if not store.set_unlocked(change['dayNumber'], False):
+                print(f"⚠️ Day {change['dayNumber']} not found")
+        
+        elif action == 'unlock-all':
+            store.unlock_all(change['at'], change.get('unlockedBy', 'admin'))
+        
+        elif action == 'upload':
+            # Replaces any existing recording for this day
+            platform = change.get('platform') or self._detect_platform(change['videoUrl'])
+            store.replace_recording(Recording(
+                recording_id=change['recordingId'],
+                day_number=change['dayNumber'],
+                title=change['title'],
+                video_url=change['videoUrl'],
+                embed_url=self._generate_embed_url(change['videoUrl'], platform),
+                platform=platform,
+                duration=change['duration'],
+                uploaded_at=change['at'],
+                uploaded_by=change.get('uploadedBy', 'admin'),
+                view_count=0,
+                is_active=True
+            ))
+        
+        elif action == 'remove':
+            store.remove_recordings_for_day(change['dayNumber'])
+    
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.utcnow().isoformat() + 'Z'
+    
+    @classmethod
+    def _unlock_change(cls, day_number: int, unlocked_by: str = 'admin') -> Dict:
+        return {'action': 'unlock', 'dayNumber': day_number, 'unlockedBy': unlocked_by, 'at': cls._timestamp()}
+    
+    @classmethod
+    def _lock_change(cls, day_number: int) -> Dict:
+        return {'action': 'lock', 'dayNumber': day_number, 'at': cls._timestamp()}
+    
+    @classmethod
+    def _unlock_all_change(cls, unlocked_by: str = 'admin') -> Dict:
+        return {'action': 'unlock-all', 'unlockedBy': unlocked_by, 'at': cls._timestamp()}
+    
+    @classmethod
+    def _upload_change(cls, day_number: int, title: str, video_url: str, duration: str,
+                       platform: Optional[str] = None, uploaded_by: str = 'admin') -> Dict:
+        return {
+            'action': 'upload',
+            'recordingId': cls._generate_uuid(),
+            'dayNumber': day_number,
+            'title': title,
+            'videoUrl': video_url,
+            'duration': duration,
+            'platform': platform or cls._detect_platform(video_url),
+            'uploadedBy': uploaded_by,
+            'at': cls._timestamp()
+        }
+    
+    @classmethod
+    def _remove_change(cls, day_number: int) -> Dict:
+        return {'action': 'remove', 'dayNumber': day_number, 'at': cls._timestamp()}
+    
+    @classmethod
+    def _normalize_change(cls, change: Dict) -> Dict:
+        """Fill in ids/timestamps for a change record read from a file"""
+        change = dict(change)
+        change.setdefault('at', cls._timestamp())
+        if change.get('action') == 'upload':
+            change.setdefault('recordingId', cls._generate_uuid())
+        return change
+    
+    @staticmethod
+    def _change_error(change: Dict) -> Optional[str]:
+        """Why a change record can't be applied, or None if it's complete"""
+        if not isinstance(change, dict):
+            return f"Change record is not an object: {change!r}"
+        action = change.get('action')
+        if action not in CHANGE_ACTIONS:
+            return f"Unknown change action: {action}"
+        missing = [field for field in CHANGE_FIELDS[action] if change.get(field) in (None, '')]
+        if missing:
+            return f"'{action}' change is missing {', '.join(missing)}"
+        day_number = change.get('dayNumber')
+        if 'dayNumber' in CHANGE_FIELDS[action] and (isinstance(day_number, bool) or not isinstance(day_number, int)):
+            return f"'{action}' change has a non-integer dayNumber: {day_number!r}"
+        return None
+    
+    @classmethod
+    def _valid_events(cls, events: List[Dict]) -> List[Dict]:
+        """Logged changes that can be replayed; broken ones are skipped so they can't block every load"""
+        valid = []
+        for event in events:
+            error = cls._change_error(event)
+            if error:
+                print(f"⚠️ Skipping change log entry: {error}")
+            else:
+                valid.append(event)
+        return valid
+    
+    # ========== Change Log ==========
+    
+    def _append_events(self, changes: List[Dict]) -> bool:
+        """Append change records to the log with a single DFS append at the current end offset"""
+        payload = ''.join(json.dumps(c, separators=(',', ':')) + '\n' for c in changes).encode('utf-8')
+        url = f"{self.onelake_base}/{EVENT_LOG_FILE}"
+        
+        for attempt in range(1, self.max_write_attempts + 1):
+            try:
+                end, etag = self._log_state()
+                if end is None:
+                    # First event: create the log, tolerating a concurrent creator
+                    create_response = self._make_request('PUT', f"{url}?resource=file",
+                                                         headers={'If-None-Match': '*'})
+                    if create_response.status_code not in [200, 201, 409, 412]:
+                        print(f"Error creating change log: {create_response.status_code} - {create_response.text}")
+                        return False
+                    continue
+                
+                # Hold a short lease from append to flush so concurrent appenders can't
+                # interleave, and only commit if nobody flushed since we measured the end
+                lease_id = self._generate_uuid()
+                append_response = self._append_chunk(
+                    EVENT_LOG_FILE, end, payload, 'application/x-ndjson',
+                    headers={'x-ms-lease-action': 'acquire', 'x-ms-lease-duration': '15',
+                             'x-ms-proposed-lease-id': lease_id}
+                )
+                if append_response.status_code in [200, 202]:
+                    flush_url = f"{url}?action=flush&position={end + len(payload)}"
+                    flush_response = self._make_request(
+                        'PATCH', flush_url,
+                        headers={'x-ms-lease-action': 'release', 'x-ms-lease-id': lease_id,
+                                 'If-Match': etag}
+                    )
+                    if flush_response.status_code in [200, 201]:
+                        self._maybe_compact(end + len(payload))
+                        return True
+                
+                # Another writer moved the end of the log; re-read the length and try again
+                print(f"⚠️ Change log moved while appending, retrying ({attempt}/{self.max_write_attempts})")
+                time.sleep(random.uniform(0, 0.2 * attempt))
+                
+            except Exception as e:
+                print(f"Error appending to change log: {e}")
                 return False
+        
+        print(f"❌ Gave up appending to the change log after {self.max_write_attempts} attempts")
+        return False
+    
+    def _log_state(self):
+        """Committed length and ETag of the change log; length is None if it doesn't exist yet"""
+        response = self._make_request('HEAD', f"{self.onelake_base}/{EVENT_LOG_FILE}")
+        if response.status_code == 404:
+            return None, None
+        return int(response.headers.get('Content-Length', 0)), response.headers.get('ETag')
+    
+    def _load_checkpoint(self):
+        """Log offset already folded into the snapshots, with the checkpoint's ETag
+        
+        Falls back to offset 0 (replay everything) when the checkpoint can't be read,
+        which is always safe because replay is idempotent.
+        """
+        try:
+            status, checkpoint, etag = self._fetch_json(EVENT_CHECKPOINT_FILE)
+            if status == 200:
+                return checkpoint.get('offset', 0), etag
+        except UnreadableSnapshot as e:
+            # Keep its ETag so the next compaction overwrites the broken checkpoint
+            print(f"⚠️ {e}, replaying the change log from the start")
+            return 0, e.etag
+        except Exception as e:
+            print(f"⚠️ Could not read change log checkpoint, replaying from the start: {e}")
+        return 0, None
+    
+    def read_events(self, offset: int = 0):
+        """Read complete change records from `offset`; returns (events, offset after the last one)"""
+        response = self._make_request('GET', f"{self.onelake_base}/{EVENT_LOG_FILE}",
+                                      headers={'Range': f"bytes={offset}-"} if offset else {})
+        if response.status_code in [404, 416]:
+            return [], offset
+        if response.status_code not in [200, 206]:
+            raise RuntimeError(f"Failed to read change log: {response.status_code}")
+        
+        # Ignore a trailing partial line from an append that hasn't been flushed
+        body = response.content
+        complete = body[:body.rfind(b'\n') + 1]
+        events = []
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                print(f"⚠️ Skipping unreadable change log line: {line[:80]!r}")
+        return events, offset + len(complete)
+    
+    def _replay_events(self, store: TrainingStore, days: bool = True, recordings: bool = True):
+        """Apply logged changes that are newer than the snapshot to the store"""
+        offset, _ = self._load_checkpoint()
+        events, _ = self.read_events(offset)
+        wanted = {name for name, loaded in (('days', days), ('recordings', recordings)) if loaded}
+        for event in self._valid_events(events):
+            if CHANGE_ACTIONS[event['action']] in wanted:
+                self._apply_change(store, event)
+    
+    def _maybe_compact(self, log_end: int):
+        offset, _ = self._load_checkpoint()
+        if log_end - offset >= self.compact_threshold:
+            self.compact()
+    
+    def compact(self) -> bool:
+        """Fold logged changes into training_days.json/recordings.json and advance the checkpoint
+        
+        Replaying a change is idempotent, so a compaction that dies between writing the
+        snapshots and the checkpoint just replays the same events again next time.
+        """
+        try:
+            offset, checkpoint_etag = self._load_checkpoint()
+            events, end = self.read_events(offset)
+            if not events:
+                return True
             
-            # Step 2: Append content
-            append_url = f"{self.onelake_base}/{file_path}?action=append&position=0"
-            append_response = self._make_request(
-                'PATCH',
-                append_url,
-                headers={'Content-Type': 'application/json'},
-                data=content_bytes
-            )
-            
-            if append_response.status_code not in [200, 202]:
-                print(f"Error appending content: {append_response.status_code} - {append_response.text}")
+            # Broken entries are skipped for good: the checkpoint moves past them
+            valid = self._valid_events(events)
+            if valid and not self._apply_to_snapshots(valid):
                 return False
             
-            # Step 3: Flush to finalize
-            flush_url = f"{self.onelake_base}/{file_path}?action=flush&position={content_length}"
-            flush_response = self._make_request('PATCH', flush_url)
-            
-            if flush_response.status_code not in [200, 201]:
-                print(f"Error flushing file: {flush_response.status_code} - {flush_response.text}")
-                return False
+            checkpoint = {'offset': end, 'compactedAt': self._timestamp(), 'events': len(valid),
+                          'skipped': len(events) - len(valid)}
+            try:
+                if not self._save_json(EVENT_CHECKPOINT_FILE, checkpoint, checkpoint_etag, conditional=True):
+                    return False
+            except WriteConflict:
+                # Someone else compacted concurrently; their checkpoint covers the same events
+                pass
             
+            print(f"✅ Compacted {len(valid)} change(s) into snapshots")
             return True
             
         except Exception as e:
-            print(f"Error saving recordings: {e}")
+            print(f"❌ Error compacting change log: {e}")
             return False
     
     # ========== Stats & Reporting ==========
@@ -314,18 +1233,7 @@ class FabricAdminClient:
     def get_stats(self) -> Dict:
         """Get dashboard statistics"""
         try:
-            days = self.get_all_days()
-            recordings = self.get_all_recordings()
-            
-            unlocked = sum(1 for d in days if d.get('isUnlocked', False))
-            
-            return {
-                'totalDays': len(days),
-                'unlockedDays': unlocked,
-                'lockedDays': len(days) - unlocked,
-                'recordingsAvailable': len(recordings),
-                'lastUpdated': datetime.utcnow().isoformat() + 'Z'
-            }
+            return self.load_store().stats()
         except Exception as e:
             print(f"❌ Error getting stats: {e}")
             return {}
@@ -335,23 +1243,8 @@ class FabricAdminClient:
     def export_for_github(self, output_dir: str = 'data') -> bool:
         """Export data to JSON files for GitHub commit"""
         try:
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Export training days
-            days = self.get_all_days()
-            with open(f"{output_dir}/training_days.json", 'w') as f:
-                json.dump(days, f, indent=2)
-            
-            # Export recordings
-            recordings = self.get_all_recordings()
-            with open(f"{output_dir}/recordings.json", 'w') as f:
-                json.dump(recordings, f, indent=2)
-            
-            # Export stats
-            stats = self.get_stats()
-            with open(f"{output_dir}/stats.json", 'w') as f:
-                json.dump(stats, f, indent=2)
-            
+            store = self.load_store()
+            self._write_export(output_dir, store.days_json(), store.recordings_json(), store.stats())
             print(f"✅ Data exported to {output_dir}/")
             return True
             
@@ -359,6 +1252,20 @@ class FabricAdminClient:
             print(f"❌ Error exporting data: {e}")
             return False
     
+    @staticmethod
+    def _write_export(output_dir: str, days: List[Dict], recordings: List[Dict], stats: Dict):
+        """Write the exported JSON files to disk"""
+        os.makedirs(output_dir, exist_ok=True)
+        
+        with open(f"{output_dir}/training_days.json", 'w') as f:
+            json.dump(days, f, indent=2)
+        
+        with open(f"{output_dir}/recordings.json", 'w') as f:
+            json.dump(recordings, f, indent=2)
+        
+        with open(f"{output_dir}/stats.json", 'w') as f:
+            json.dump(stats, f, indent=2)
+    
     # ========== Helper Methods ==========
     
     @staticmethod
@@ -368,8 +1275,29 @@ class FabricAdminClient:
         return str(uuid.uuid4())
     
     @staticmethod
-    def _generate_embed_url(video_url: str) -> str:
+    def _detect_platform(video_url: str) -> str:
+        """LOCAL for a video file name in the recordings folder, otherwise the hosted default
+        
+        Hosted links are recognised first, so "youtube.com/watch?v=..." without a scheme stays hosted.
+        """
+        lowered = video_url.lower()
+        if any(site in lowered for site in HOSTED_VIDEO_SITES):
+            return 'YOUTUBE'
+        if (not re.match(r'^[a-z][a-z0-9+.-]*://', video_url, re.I)
+                and lowered.split('?', 1)[0].endswith(LOCAL_VIDEO_SUFFIXES)):
+            return 'LOCAL'
+        return 'YOUTUBE'
+    
+    @staticmethod
+    def _generate_embed_url(video_url: str, platform: Optional[str] = None) -> str:
         """Convert video URL to embed URL"""
+        # Local file, streamed by start_presentation.py from its recordings folder
+        if platform == 'LOCAL':
+            name = video_url.replace('\\', '/').lstrip('/')
+            if name.startswith(LOCAL_RECORDINGS_PATH):
+                name = name[len(LOCAL_RECORDINGS_PATH):]
+            return LOCAL_RECORDINGS_PATH + quote(name)
+        
         # YouTube
         if 'youtube.com/watch' in video_url:
             from urllib.parse import urlparse, parse_qs
@@ -427,88 +1355,354 @@ class FabricAdminClient:
         ]
 
 
-# ========== CLI Interface ==========
+# Which file each change action edits
+CHANGE_ACTIONS = {
+    'unlock': 'days',
+    'lock': 'days',
+    'unlock-all': 'days',
+    'upload': 'recordings',
+    'remove': 'recordings'
+}
 
-def main():
-    """Command-line interface for admin operations"""
-    import sys
+# Fields each change record needs before it can be applied (or logged and replayed later)
+CHANGE_FIELDS = {
+    'unlock': ('dayNumber', 'at'),
+    'lock': ('dayNumber',),
+    'unlock-all': ('at',),
+    'upload': ('recordingId', 'dayNumber', 'title', 'videoUrl', 'duration', 'at'),
+    'remove': ('dayNumber',)
+}
+
+
+class ChangeBatch:
+    """Collects lock/unlock/recording changes and applies them in one read and one write per file
+    
+    Usage:
+        with client.batch() as batch:
+            batch.unlock(1).unlock(2).upload_recording(1, "Day 1", url, "2h")
+    """
+    
+    def __init__(self, client: FabricAdminClient):
+        self.client = client
+        self.changes: List[Dict] = []
+    
+    def unlock(self, day_number: int, unlocked_by: str = 'admin') -> 'ChangeBatch':
+        self.changes.append(self.client._unlock_change(day_number, unlocked_by))
+        return self
+    
+    def lock(self, day_number: int) -> 'ChangeBatch':
+        self.changes.append(self.client._lock_change(day_number))
+        return self
+    
+    def unlock_all(self, unlocked_by: str = 'admin') -> 'ChangeBatch':
+        self.changes.append(self.client._unlock_all_change(unlocked_by))
+        return self
+    
+    def upload_recording(self, day_number: int, title: str, video_url: str, duration: str,
+                         platform: Optional[str] = None, uploaded_by: str = 'admin') -> 'ChangeBatch':
+        self.changes.append(self.client._upload_change(day_number, title, video_url, duration,
+                                                       platform, uploaded_by))
+        return self
+    
+    def remove_recording(self, day_number: int) -> 'ChangeBatch':
+        self.changes.append(self.client._remove_change(day_number))
+        return self
+    
+    def add(self, change: Dict) -> 'ChangeBatch':
+        """Queue a raw change record (as read from a changes file)"""
+        self.changes.append(self.client._normalize_change(change))
+        return self
+    
+    def commit(self) -> bool:
+        """Apply all queued changes; returns False if any write failed"""
+        if not self.changes:
+            return True
+        try:
+            success = self.client.apply_changes(self.changes)
+            if success:
+                print(f"✅ Applied {len(self.changes)} change(s)")
+                self.changes = []
+            return success
+        except Exception as e:
+            print(f"❌ Error applying changes: {e}")
+            return False
+    
+    def __enter__(self) -> 'ChangeBatch':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+class AsyncFabricAdminClient:
+    """asyncio front-end for FabricAdminClient that runs independent calls concurrently
+    
+    Each operation runs the synchronous client in a worker thread (sharing its pooled
+    session and token cache), bounded by a semaphore. Read-modify-write operations on
+    the same file are serialized so concurrent mutations don't overwrite each other.
+    """
+    
+    def __init__(self, client: Optional[FabricAdminClient] = None, max_concurrency: Optional[int] = None):
+        self.client = client or FabricAdminClient()
+        limit = max_concurrency or int(os.getenv('FABRIC_MAX_CONCURRENCY', '8'))
+        self._semaphore = asyncio.Semaphore(limit)
+        self._days_lock = asyncio.Lock()
+        self._recordings_lock = asyncio.Lock()
+    
+    async def _run(self, func, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+    
+    # ========== Training Days Operations ==========
+    
+    async def load_store(self) -> TrainingStore:
+        """Load days and recordings concurrently into one indexed store"""
+        days, recordings = await asyncio.gather(
+            self._run(self.client._load_days), self._run(self.client._load_recordings)
+        )
+        store = TrainingStore(days[0], recordings[0])
+        if self.client.event_log:
+            await self._run(self.client._replay_events, store)
+        return store
+    
+    async def get_all_days(self) -> List[Dict]:
+        return await self._run(self.client.get_all_days)
+    
+    async def unlock_day(self, day_number: int, unlocked_by: str = 'admin') -> bool:
+        async with self._days_lock:
+            return await self._run(self.client.unlock_day, day_number, unlocked_by)
+    
+    async def lock_day(self, day_number: int) -> bool:
+        async with self._days_lock:
+            return await self._run(self.client.lock_day, day_number)
+    
+    async def unlock_all_days(self, unlocked_by: str = 'admin') -> bool:
+        async with self._days_lock:
+            return await self._run(self.client.unlock_all_days, unlocked_by)
+    
+    # ========== Recording Operations ==========
+    
+    async def get_all_recordings(self) -> List[Dict]:
+        return await self._run(self.client.get_all_recordings)
+    
+    async def upload_recording(self, day_number: int, title: str, video_url: str,
+                               duration: str, platform: Optional[str] = None,
+                               uploaded_by: str = 'admin') -> bool:
+        async with self._recordings_lock:
+            return await self._run(self.client.upload_recording, day_number, title,
+                                   video_url, duration, platform, uploaded_by)
     
-    client = FabricAdminClient()
-    
-    if len(sys.argv) < 2:
-        print("""
-Power BI Training Admin Tool
-
-Usage:
-  python admin_fabric.py <command> [args]
-
-Commands:
-  unlock <day>          Unlock a specific day (1-12)
-  lock <day>            Lock a specific day
-  unlock-all            Unlock all 12 days
-  
-  upload <day> <title> <url> <duration>
-                        Upload recording for a day
-                        Example: upload 1 "Day 1 Recording" "https://youtube.com/..." "2h 30min"
-  
-  remove <day>          Remove recording for a day
-  
-  stats                 Show current statistics
-  export                Export data to data/ folder for GitHub
-  
-  list                  List all days and their status
+    async def remove_recording(self, day_number: int) -> bool:
+        async with self._recordings_lock:
+            return await self._run(self.client.remove_recording, day_number)
+    
+    # ========== Batched Changes ==========
+    
+    async def apply_changes(self, changes: List[Dict]) -> bool:
+        async with self._days_lock, self._recordings_lock:
+            return await self._run(self.client.apply_changes, changes)
+    
+    # ========== Stats & Reporting ==========
+    
+    async def get_stats(self) -> Dict:
+        try:
+            store = await self.load_store()
+            return store.stats()
+        except Exception as e:
+            print(f"❌ Error getting stats: {e}")
+            return {}
+    
+    # ========== Sync to GitHub ==========
+    
+    async def export_for_github(self, output_dir: str = 'data') -> bool:
+        """Export data to JSON files, fetching days and recordings concurrently"""
+        try:
+            store = await self.load_store()
+            await asyncio.to_thread(FabricAdminClient._write_export, output_dir, store.days_json(),
+                                    store.recordings_json(), store.stats())
+            print(f"✅ Data exported to {output_dir}/")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error exporting data: {e}")
+            return False
+
+
+# ========== CLI Interface ==========
+
+def parse_day_spec(spec: str) -> List[int]:
+    """Parse a day list such as "1,2,5-8" into [1, 2, 5, 6, 7, 8]; raises ValueError for bad specs"""
+    days = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (int(x) for x in part.split('-', 1))
+            if start > end:
+                raise ValueError(f"Reversed day range: {part} (did you mean {end}-{start}?)")
+            days.extend(range(start, end + 1))
+        else:
+            days.append(int(part))
+    if not days:
+        raise ValueError(f"No days given: {spec!r}")
+    return days
+
+
+def load_changes_file(path: str) -> List[Dict]:
+    """Read change records from a JSON array or a JSON Lines file"""
+    with open(path) as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
 
+
+CLI_EXAMPLES = """
 Examples:
   python admin_fabric.py unlock 1
+  python admin_fabric.py unlock 1-6
   python admin_fabric.py unlock-all
   python admin_fabric.py upload 1 "Session 1" "https://youtu.be/xxx" "2h"
   python admin_fabric.py export
-        """)
-        sys.exit(1)
+  python admin_fabric.py --cohort 2026-spring unlock 1-3
+  python admin_fabric.py --offline list
+"""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for the admin CLI (global options are accepted before or after the command)"""
+    def add_global_options(parser, defaults):
+        default = (lambda value: value) if defaults else (lambda value: argparse.SUPPRESS)
+        parser.add_argument('--course', default=default(None),
+                            help='course namespace (default: FABRIC_COURSE or power-bi)')
+        parser.add_argument('--cohort', default=default(None),
+                            help="operate on one cohort's files only (default: FABRIC_COHORT)")
+        parser.add_argument('--offline', action='store_true', default=default(False),
+                            help='work on the local data/*.json files instead of OneLake (no sign-in)')
+        parser.add_argument('--data-dir', default=default(DEFAULT_DATA_DIR),
+                            help='folder used by --offline (default: data)')
+    
+    parser = argparse.ArgumentParser(
+        prog='admin_fabric.py', description='Power BI Training Admin Tool',
+        epilog=CLI_EXAMPLES, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    add_global_options(parser, defaults=True)
+    commands = parser.add_subparsers(dest='command', metavar='<command>')
     
-    command = sys.argv[1].lower()
+    def command(name, help_text):
+        sub = commands.add_parser(name, help=help_text, description=help_text)
+        add_global_options(sub, defaults=False)
+        return sub
+    
+    command('unlock', 'Unlock days, e.g. 3 or 1,2,5-8 (one write for all)').add_argument('days')
+    command('lock', 'Lock days, e.g. 3 or 10-12').add_argument('days')
+    command('unlock-all', 'Unlock all 12 days')
+    upload = command('upload', 'Upload recording for a day; a file name (e.g. day01.mp4) is a LOCAL '
+                               'recording streamed by start_presentation.py from its recordings/ folder')
+    upload.add_argument('day', type=int)
+    upload.add_argument('title')
+    upload.add_argument('url')
+    upload.add_argument('duration', help='e.g. "2h 30min"')
+    command('remove', 'Remove recording for a day').add_argument('day', type=int)
+    command('batch', 'Apply changes from a JSON/JSON Lines file in one write, '
+                     'e.g. {"action": "unlock", "dayNumber": 3}').add_argument('file')
+    command('compact', 'Fold the change log into the snapshot files')
+    command('history', 'Show the last n logged changes').add_argument('n', type=int, nargs='?', default=20)
+    command('stats', 'Show current statistics')
+    command('export', 'Export data to data/ folder for GitHub')
+    command('list', 'List all days and their status')
+    command('cohorts', 'List the cohorts stored for the course')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line interface for admin operations"""
+    import sys
+    
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
     
     try:
-        if command == 'unlock' and len(sys.argv) >= 3:
-            day = int(sys.argv[2])
-            client.unlock_day(day)
+        client = FabricAdminClient(course=args.course, cohort=args.cohort,
+                                   offline=args.offline or None, data_dir=args.data_dir)
+        if client.offline:
+            print(f"📁 Offline: using {client.local_dir}/")
+        
+        if args.command in ('unlock', 'lock'):
+            days = parse_day_spec(args.days)
+            if len(days) == 1:
+                if args.command == 'unlock':
+                    success = client.unlock_day(days[0])
+                else:
+                    success = client.lock_day(days[0])
+            else:
+                batch = client.batch()
+                for day in days:
+                    if args.command == 'unlock':
+                        batch.unlock(day)
+                    else:
+                        batch.lock(day)
+                success = batch.commit()
+            if not success:
+                sys.exit(1)
         
-        elif command == 'lock' and len(sys.argv) >= 3:
-            day = int(sys.argv[2])
-            client.lock_day(day)
+        elif args.command == 'batch':
+            batch = client.batch()
+            for change in load_changes_file(args.file):
+                batch.add(change)
+            if not batch.commit():
+                sys.exit(1)
         
-        elif command == 'unlock-all':
+        elif args.command == 'unlock-all':
             client.unlock_all_days()
         
-        elif command == 'upload' and len(sys.argv) >= 6:
-            day = int(sys.argv[2])
-            title = sys.argv[3]
-            url = sys.argv[4]
-            duration = sys.argv[5]
-            client.upload_recording(day, title, url, duration)
+        elif args.command == 'upload':
+            client.upload_recording(args.day, args.title, args.url, args.duration)
         
-        elif command == 'remove' and len(sys.argv) >= 3:
-            day = int(sys.argv[2])
-            client.remove_recording(day)
+        elif args.command == 'remove':
+            client.remove_recording(args.day)
         
-        elif command == 'stats':
+        elif args.command == 'compact':
+            if not client.compact():
+                sys.exit(1)
+        
+        elif args.command == 'history':
+            events, _ = client.read_events()
+            events = client._valid_events(events)
+            print(f"\n📜 Last {min(args.n, len(events))} of {len(events)} logged change(s):\n")
+            for event in events[-args.n:]:
+                target = f"Day {event['dayNumber']}" if 'dayNumber' in event else 'All days'
+                print(f"{event.get('at', '?')}  {event['action']:<10} {target}")
+        
+        elif args.command == 'stats':
             stats = client.get_stats()
             print("\n📊 Training Portal Statistics:")
             print(json.dumps(stats, indent=2))
         
-        elif command == 'export':
-            client.export_for_github()
+        elif args.command == 'export':
+            output_dir = os.path.join('data', client.course, client.cohort) if client.cohort else 'data'
+            asyncio.run(AsyncFabricAdminClient(client).export_for_github(output_dir))
+        
+        elif args.command == 'cohorts':
+            cohorts = client.list_cohorts()
+            print(f"\n👥 Cohorts for {client.course}:\n")
+            for cohort in cohorts:
+                print(f"  {cohort}")
+            if not cohorts:
+                print("  (none)")
         
-        elif command == 'list':
+        elif args.command == 'list':
             days = client.get_all_days()
             print("\n📚 Training Days Status:\n")
             for day in days:
                 status = "🔓 Unlocked" if day.get('isUnlocked') else "🔒 Locked"
                 print(f"Day {day['dayNumber']:2d}: {status} - {day['title']}")
-        
-        else:
-            print(f"❌ Unknown command or invalid arguments: {command}")
-            sys.exit(1)
     
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,219 @@
+"""
+Load test for the presentation server
+Starts start_presentation.py on a free local port and drives simulated trainees through it
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import start_presentation  # noqa: E402
+
+PORTAL_PAGE = '/PowerBI_Training_Portal.html'
+DATA_FILES = ['/data/training_days.json', '/data/recordings.json']
+ASSET_SUFFIXES = {'.css', '.js', '.jpg', '.jpeg', '.png', '.svg', '.webp', '.woff2'}
+PERCENTILES = (50, 90, 95, 99)
+
+class QuietHandler(start_presentation.CustomHTTPRequestHandler):
+    """Request handler without the per-request access log"""
+
+    def log_message(self, format, *args):
+        pass
+
+def discover_paths(root):
+    """Presentations and static assets a trainee can fetch, in a stable order"""
+    presentations = sorted(
+        '/' + p.relative_to(root).as_posix() for p in (root / 'presentations').glob('Day_*_Presentation.html')
+    )
+    assets = sorted(
+        '/' + p.relative_to(root).as_posix()
+        for p in (root / 'assets').rglob('*')
+        if p.is_file() and p.suffix.lower() in ASSET_SUFFIXES
+    )
+    return presentations, assets
+
+def build_script(rng, presentations, assets, assets_per_visit):
+    """One visit: portal, live data, a day's slides and a few assets"""
+    script = [PORTAL_PAGE] + DATA_FILES
+    if presentations:
+        script.append(rng.choice(presentations))
+    if assets:
+        script += rng.sample(assets, min(assets_per_visit, len(assets)))
+    return script
+
+def fetch(host, port, path, etags, revalidate):
+    """GET one URL on a fresh connection (the server speaks HTTP/1.0); returns (status, bytes, seconds)"""
+    headers = {'Accept-Encoding': 'gzip, br'}
+    if revalidate and path in etags:
+        headers['If-None-Match'] = etags[path]
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request('GET', path.replace(' ', '%20'), headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        etag = response.getheader('ETag')
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - start
+    if etag:
+        etags[path] = etag
+    return response.status, len(body), elapsed
+
+def run_trainee(trainee_id, args, host, port, presentations, assets):
+    """Simulate one trainee visiting the portal several times, with a private browser cache"""
+    rng = random.Random(f'{args.seed}-{trainee_id}')
+    etags = {}
+    samples = []
+    for _ in range(args.visits):
+        for path in build_script(rng, presentations, assets, args.assets_per_visit):
+            try:
+                status, size, elapsed = fetch(host, port, path, etags, args.revalidate)
+            except (OSError, http.client.HTTPException) as e:
+                samples.append((path, 'error', 0, 0.0, type(e).__name__))
+                continue
+            samples.append((path, status, size, elapsed, None))
+        if args.think_time:
+            time.sleep(rng.uniform(0, args.think_time / 1000))
+    return samples
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    summary = {f'p{p}': round(percentile(latencies, p) * 1000, 3) for p in PERCENTILES}
+    summary['mean'] = round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0
+    summary['max'] = round(latencies[-1] * 1000, 3) if latencies else 0.0
+    return summary
+
+def summarize(samples, wall_time):
+    ok = [s for s in samples if s[1] != 'error']
+    errors = Counter(s[4] for s in samples if s[1] == 'error')
+    by_kind = {}
+    for path, status, size, elapsed, _ in ok:
+        if path == PORTAL_PAGE:
+            kind = 'portal'
+        elif path.startswith('/data/'):
+            kind = 'data'
+        elif path.startswith('/presentations/'):
+            kind = 'presentation'
+        else:
+            kind = 'asset'
+        by_kind.setdefault(kind, []).append(elapsed)
+    total_bytes = sum(s[2] for s in ok)
+    return {
+        'requests': len(samples),
+        'errors': sum(errors.values()),
+        'errorTypes': dict(errors),
+        'statusCodes': {str(k): v for k, v in sorted(Counter(s[1] for s in ok).items())},
+        'wallTimeSeconds': round(wall_time, 3),
+        'requestsPerSecond': round(len(ok) / wall_time, 1) if wall_time else 0.0,
+        'bytes': total_bytes,
+        'megabytesPerSecond': round(total_bytes / wall_time / 1024 / 1024, 2) if wall_time else 0.0,
+        'latencyMs': latency_summary([s[3] for s in ok]),
+        'latencyMsByKind': {kind: latency_summary(values) for kind, values in sorted(by_kind.items())},
+    }
+
+def run_benchmark(args):
+    presentations, assets = discover_paths(REPO_ROOT)
+    if args.precompress:
+        start_presentation.CustomHTTPRequestHandler.file_cache.warm(REPO_ROOT)
+
+    server = start_presentation.create_server('127.0.0.1', 0, args.mode, args.workers, args.backlog,
+                                              handler_class=QuietHandler)
+    host, port = server.server_address[:2]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.trainees) as pool:
+            futures = [pool.submit(run_trainee, i, args, host, port, presentations, assets)
+                       for i in range(args.trainees)]
+            samples = [sample for future in futures for sample in future.result()]
+        wall_time = time.perf_counter() - start
+        metrics = server.metrics
+        cache_hit_ratio = metrics.cache_hit_ratio(start_presentation.CustomHTTPRequestHandler.file_cache)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    return {
+        'benchmark': 'presentation-server',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            'trainees': args.trainees,
+            'visits': args.visits,
+            'assetsPerVisit': args.assets_per_visit,
+            'thinkTimeMs': args.think_time,
+            'revalidate': args.revalidate,
+            'precompress': args.precompress,
+            'mode': args.mode,
+            'workers': args.workers,
+            'backlog': args.backlog,
+            'seed': args.seed,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'results': summarize(samples, wall_time),
+        'server': {'cacheHitRatio': round(cache_hit_ratio, 4)},
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the presentation server with simulated trainees')
+    parser.add_argument('--trainees', type=int, default=30, help='concurrent simulated trainees (default: 30)')
+    parser.add_argument('--visits', type=int, default=5, help='portal visits per trainee (default: 5)')
+    parser.add_argument('--assets-per-visit', type=int, default=3,
+                        help='static assets fetched on each visit (default: 3)')
+    parser.add_argument('--think-time', type=int, default=0,
+                        help='max random pause between visits in ms (default: 0)')
+    parser.add_argument('--no-revalidate', dest='revalidate', action='store_false',
+                        help='ignore ETags instead of sending If-None-Match on repeat visits')
+    parser.add_argument('--precompress', action='store_true', help='warm the compressed file cache first')
+    parser.add_argument('--mode', choices=['threaded', 'single'], default='threaded')
+    parser.add_argument('--workers', type=int, default=start_presentation.DEFAULT_WORKERS)
+    parser.add_argument('--backlog', type=int, default=start_presentation.DEFAULT_BACKLOG)
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the trainee scripts (default: 1)')
+    parser.add_argument('--output', help='write the JSON result to this file as well as stdout')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🏁 Benchmarking with {args.trainees} trainees x {args.visits} visits ({args.mode} mode)...",
+          file=sys.stderr)
+    result = run_benchmark(args)
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + '\n', encoding='utf-8')
+        print(f"✅ Results saved to {args.output}", file=sys.stderr)
+    results = result['results']
+    print(f"📊 {results['requestsPerSecond']} req/s, p95 {results['latencyMs']['p95']}ms, "
+          f"{results['errors']} error(s)", file=sys.stderr)
+    return 1 if results['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
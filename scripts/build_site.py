@@ -0,0 +1,704 @@
+"""
+Static site build for GitHub Pages
+Minifies HTML/CSS/JS into dist/, gives assets content-hashed names and rewrites references to them
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+try:
+    from PIL import Image, ImageOps, features  # optional: pip install Pillow
+except ImportError:
+    Image = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = REPO_ROOT / 'dist'
+MANIFEST_FILE = 'manifest.json'
+CACHE_FILE = '.build-cache.json'
+
+# Bump when the minifiers or rewriting change so cached outputs are rebuilt
+BUILD_VERSION = 3
+
+# What gets published: entry pages keep their names, data/ is fetched and live-updated by name
+SITE_PATTERNS = ['*.html', 'presentations/*.html', 'presentations/*.css', 'presentations/*.js', 'data/*.json',
+                 'assets/**/*']
+HASHED_SUFFIXES = {'.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.avif', '.ico',
+                   '.woff', '.woff2', '.ttf'}
+HASH_LENGTH = 10
+
+# Responsive image variants (needs Pillow); encoded files are cached by source hash across builds
+IMAGE_VERSION = 1
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png'}
+RESPONSIVE_WIDTHS = (480, 960, 1440)
+IMAGE_QUALITY = {'JPEG': 82, 'PNG': None, 'WEBP': 80, 'AVIF': 60}
+IMAGE_TYPES = {'JPEG': ('image/jpeg', '.jpg'), 'PNG': ('image/png', '.png'),
+               'WEBP': ('image/webp', '.webp'), 'AVIF': ('image/avif', '.avif')}
+DEFAULT_IMAGE_CACHE = Path.home() / '.cache' / 'powerbi-training' / 'images'
+
+# -- Minifiers ---------------------------------------------------------------
+
+CSS_TOKEN = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)''', re.S)
+CSS_TIGHT = set('{};,>')
+
+def minify_css(css):
+    """Drop comments and collapse whitespace, leaving strings and selector spacing intact"""
+    out = []
+    pos = 0
+    for match in CSS_TOKEN.finditer(css):
+        out.append(css[pos:match.start()])
+        string, comment, space = match.groups()
+        if string:
+            out.append(string)
+        elif space:
+            out.append(' ')
+        pos = match.end()
+    out.append(css[pos:])
+    text = ''.join(out)
+
+    # Second pass: remove the spaces that can't matter, outside strings
+    result = []
+    for i, piece in enumerate(re.split(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''', text)):
+        if i % 2:
+            result.append(piece)
+            continue
+        piece = re.sub(r' +', ' ', piece)
+        piece = re.sub(r' ?([{};,>]) ?', r'\1', piece)
+        piece = re.sub(r': ', ':', piece)
+        piece = piece.replace(';}', '}')
+        result.append(piece)
+    return ''.join(result).strip()
+
+JS_REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^')
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete', 'throw', 'new',
+                     'instanceof', 'yield', 'await'}
+JS_TIGHT = set('{}();,=:[]<>&|!?*')
+
+def _skip_string(js, i):
+    quote_char = js[i]
+    i += 1
+    while i < len(js):
+        if js[i] == '\\':
+            i += 2
+            continue
+        if js[i] == quote_char or js[i] == '\n':
+            return i + 1
+        i += 1
+    return i
+
+def _skip_template(js, i):
+    """Index just past the template literal starting at i, including nested ${...} expressions"""
+    i += 1
+    while i < len(js):
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+        elif ch == '`':
+            return i + 1
+        elif ch == '$' and js.startswith('${', i):
+            i = _skip_expression(js, i + 2)
+        else:
+            i += 1
+    return i
+
+def _skip_expression(js, i):
+    """Index just past the } closing a template expression"""
+    depth = 0
+    while i < len(js):
+        ch = js[i]
+        if ch in '"\'':
+            i = _skip_string(js, i)
+            continue
+        if ch == '`':
+            i = _skip_template(js, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            if depth == 0:
+                return i + 1
+            depth -= 1
+        i += 1
+    return i
+
+def _skip_regex(js, i):
+    i += 1
+    in_class = False
+    while i < len(js) and js[i] != '\n':
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(js) and (js[i].isalnum() or js[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+def _regex_allowed(out):
+    """Whether a / at this point starts a regex literal rather than a division"""
+    text = ''.join(out[-3:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in JS_REGEX_PREFIX:
+        return True
+    word = re.search(r'[A-Za-z_$][\w$]*$', text)
+    return bool(word and word.group() in JS_REGEX_KEYWORDS)
+
+def minify_js(js):
+    """Strip comments and indentation; line breaks are kept so automatic semicolons still apply"""
+    out = []
+    i = 0
+    length = len(js)
+    while i < length:
+        ch = js[i]
+        if ch in '"\'':
+            end = _skip_string(js, i)
+            out.append(js[i:end])
+            i = end
+        elif ch == '`':
+            end = _skip_template(js, i)
+            out.append(js[i:end])
+            i = end
+        elif ch == '/' and js.startswith('//', i):
+            end = js.find('\n', i)
+            i = length if end == -1 else end
+        elif ch == '/' and js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            out.append('\n' if '\n' in js[i:end] else ' ')
+            i = end
+        elif ch == '/' and _regex_allowed(out):
+            end = _skip_regex(js, i)
+            out.append(js[i:end])
+            i = end
+        elif ch.isspace():
+            end = i
+            while end < length and js[end].isspace():
+                end += 1
+            out.append('\n' if '\n' in js[i:end] else ' ')
+            i = end
+        else:
+            end = i + 1
+            while end < length and not js[end].isspace() and js[end] not in '"\'`/':
+                end += 1
+            out.append(js[i:end])
+            i = end
+
+    # Drop whitespace pieces next to punctuation that can't need them
+    following = [''] * len(out)
+    upcoming = ''
+    for index in range(len(out) - 1, -1, -1):
+        following[index] = upcoming
+        if out[index] not in (' ', '\n'):
+            upcoming = out[index][:1]
+
+    result = []
+    for index, piece in enumerate(out):
+        if piece in (' ', '\n'):
+            prev = result[-1][-1:] if result else ''
+            nxt = following[index]
+            if not prev or not nxt:
+                continue
+            if piece == ' ' and (prev in JS_TIGHT or nxt in JS_TIGHT):
+                continue
+            if piece == '\n' and (prev in '{(,;[' or nxt in ')]},;'):
+                continue
+            if result[-1] in (' ', '\n'):
+                if piece == '\n':
+                    result[-1] = '\n'
+                continue
+        result.append(piece)
+    return ''.join(result)
+
+HTML_PROTECTED = re.compile(r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+SCRIPT_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.I)
+
+def minify_html(html, rewrite_css=None):
+    """Remove comments and collapse whitespace; pre/textarea are untouched, inline style/script are minified"""
+    pieces = []
+    pos = 0
+    for match in HTML_PROTECTED.finditer(html):
+        pieces.append(_collapse_html(html[pos:match.start()]))
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == 'style':
+            body = minify_css(rewrite_css(body) if rewrite_css else body)
+        elif tag == 'script':
+            script_type = SCRIPT_TYPE.search(open_tag)
+            if not script_type or script_type.group(1).lower() in ('text/javascript', 'module'):
+                body = minify_js(body)
+        pieces.append(_collapse_html(open_tag) + body + close_tag)
+        pos = match.end()
+    pieces.append(_collapse_html(html[pos:]))
+    return ''.join(pieces).strip() + '\n'
+
+def _collapse_html(text):
+    text = HTML_COMMENT.sub('', text)
+    return re.sub(r'\s*\n\s*', '\n', re.sub(r'[ \t]+', ' ', text))
+
+# -- References --------------------------------------------------------------
+
+HTML_REF = re.compile(r'''(\b(?:src|href|poster)\s*=\s*)(["'])([^"'<>]+)\2''', re.I)
+CSS_REF = re.compile(r'''(url\(\s*)(["']?)([^"')]+)\2(\s*\))''', re.I)
+
+def _is_local(ref):
+    return not (re.match(r'^[a-z][a-z0-9+.-]*:', ref, re.I) or ref.startswith(('//', '#', '$', '{')))
+
+def _resolve(ref, base_dir):
+    """Repo-relative POSIX path a reference points at (plus any ?query/#fragment), or None if external"""
+    path, suffix = re.match(r'([^?#]*)(.*)', ref, re.S).groups()
+    if not path or not _is_local(ref):
+        return None, ''
+    target = os.path.normpath(os.path.join(base_dir, unquote(path))).replace(os.sep, '/')
+    return target, suffix
+
+def _relative_url(target, base_dir):
+    return quote(os.path.relpath(target, base_dir or '.').replace(os.sep, '/'))
+
+def rewrite_refs(text, pattern, base_dir, outputs):
+    """Point local references at the hashed output names"""
+    def replace(match):
+        target, suffix = _resolve(match.group(3), base_dir)
+        if target not in outputs or outputs[target] == target:
+            return match.group(0)
+        start, end = match.start(3) - match.start(), match.end(3) - match.start()
+        return match.group(0)[:start] + _relative_url(outputs[target], base_dir) + suffix + match.group(0)[end:]
+    return pattern.sub(replace, text)
+
+def find_refs(text, pattern, base_dir):
+    refs = set()
+    for match in pattern.finditer(text):
+        target, _ = _resolve(match.group(3), base_dir)
+        if target:
+            refs.add(target)
+    return refs
+
+# -- Images ------------------------------------------------------------------
+
+def modern_formats():
+    """Formats the installed Pillow can encode, best first"""
+    if Image is None:
+        return []
+    return [fmt for fmt, feature in (('AVIF', 'avif'), ('WEBP', 'webp')) if features.check(feature)]
+
+def _encode(image, fmt):
+    options = {'optimize': True}
+    if IMAGE_QUALITY[fmt]:
+        options['quality'] = IMAGE_QUALITY[fmt]
+    if fmt == 'JPEG':
+        options['progressive'] = True
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+def image_variants(raw, cache_dir):
+    """Resized and re-encoded copies of an image as [(width, format, bytes)], cached by source hash"""
+    formats = modern_formats()
+    settings = json.dumps([IMAGE_VERSION, RESPONSIVE_WIDTHS, IMAGE_QUALITY, formats]).encode()
+    entry_dir = Path(cache_dir) / hashlib.sha256(raw + settings).hexdigest()
+    index_file = entry_dir / 'index.json'
+    try:
+        index = json.loads(index_file.read_text(encoding='utf-8'))
+        return [(width, fmt, (entry_dir / name).read_bytes()) for width, fmt, name in index]
+    except (OSError, ValueError):
+        pass
+
+    with Image.open(io.BytesIO(raw)) as source:
+        original_format = source.format
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    if original_format not in IMAGE_TYPES:
+        return []
+    widths = [w for w in RESPONSIVE_WIDTHS if w < image.width] + [image.width]
+
+    variants = []
+    for width in widths:
+        resized = image if width == image.width else image.resize(
+            (width, round(image.height * width / image.width)), Image.LANCZOS
+        )
+        for fmt in formats + [original_format]:
+            if fmt == original_format and width == image.width:
+                continue  # the untouched original is published as the fallback
+            variants.append((width, fmt, _encode(resized, fmt)))
+
+    entry_dir.mkdir(parents=True, exist_ok=True)
+    index = []
+    for width, fmt, data in variants:
+        name = f"{width}w{IMAGE_TYPES[fmt][1]}"
+        (entry_dir / name).write_bytes(data)
+        index.append((width, fmt, name))
+    temp = index_file.with_name('index.json.tmp')
+    temp.write_text(json.dumps(index), encoding='utf-8')
+    os.replace(temp, index_file)
+    return variants
+
+def _srcset(variants, mime, base_dir):
+    return ', '.join(f"{_relative_url(v['path'], base_dir)} {v['width']}w"
+                     for v in sorted(variants, key=lambda v: v['width']) if v['type'] == mime)
+
+IMG_TAG = re.compile(r'<img\b[^>]*>', re.I)
+IMG_SRC = re.compile(r'''\bsrc\s*=\s*(["'])([^"']+)\1''', re.I)
+
+def add_picture_sources(html, base_dir, outputs, images):
+    """Wrap <img> tags that have responsive variants in <picture> with modern-format sources"""
+    def replace(match):
+        tag = match.group(0)
+        src = IMG_SRC.search(tag)
+        if not src or re.search(r'\bsrcset\s*=', tag, re.I):
+            return tag
+        target, _ = _resolve(src.group(2), base_dir)
+        image = images.get(target)
+        if not image:
+            return tag
+        preceding = html[:match.start()].lower()
+        if preceding.rfind('<picture') > preceding.rfind('</picture'):
+            return tag
+
+        fallback = {'path': outputs[target], 'width': image['width'], 'type': image['type']}
+        variants = image['variants'] + [fallback]
+        sources = [f'<source type="{mime}" srcset="{_srcset(variants, mime, base_dir)}" sizes="100vw">'
+                   for mime in image['modernTypes']]
+        attrs = f' srcset="{_srcset(variants, image["type"], base_dir)}" sizes="100vw"'
+        if not re.search(r'\bwidth\s*=', tag, re.I):
+            attrs += f' width="{image["width"]}" height="{image["height"]}"'
+        closing = '/>' if tag.endswith('/>') else '>'
+        img = tag[:-len(closing)].rstrip() + attrs + ' ' + closing
+        return '<picture>' + ''.join(sources) + img + '</picture>'
+    return IMG_TAG.sub(replace, html)
+
+CSS_DECLARATION = re.compile(r'([{;]\s*)([\w-]+)(\s*:\s*)([^;{}]*url\([^;{}]*)(?=[;}])')
+
+CSS_PLAIN_DECLARATION = re.compile(r'([\w-]+)\s*:\s*([^;{}]+)')
+
+def _rule_selector(css, position):
+    """Selector of the top-level rule whose block contains position, or None (nested in an at-rule)"""
+    brace = css.rfind('{', 0, position + 1)
+    if brace < 0 or css.count('{', 0, brace) != css.count('}', 0, brace):
+        return None
+    start = max(css.rfind('}', 0, brace), css.rfind(';', 0, brace), css.rfind('*/', 0, brace) + 1)
+    selector = css[start + 1:brace].strip()
+    return selector if selector and not selector.startswith('@') else None
+
+def add_image_sets(css, base_dir, outputs, images):
+    """Follow declarations using a responsive image with an image-set() copy offering modern formats
+
+    image-set() has no width descriptors, so the declaration offers the full-size image and
+    max-width media queries appended to the stylesheet repeat the declaration with each smaller
+    width (1x and 2x), along with the longhands that follow it (background-size after background).
+    """
+    def candidates(image, target, mime):
+        found = [v for v in image['variants'] if v['type'] == mime]
+        if mime == image['type']:
+            found.append({'path': outputs[target], 'width': image['width']})
+        return sorted(found, key=lambda v: v['width'])
+
+    def pick(found, width):
+        return next((v for v in found if v['width'] >= width), found[-1]) if width else found[-1]
+
+    def image_set(match, width):
+        target, _ = _resolve(match.group(3), base_dir)
+        image = images.get(target)
+        if not image:
+            return match.group(0)
+        choices = []
+        for mime in image['modernTypes'] + [image['type']]:
+            found = candidates(image, target, mime)
+            if not found:
+                continue
+            one, two = pick(found, width), pick(found, width and width * 2)
+            if width and two is not one:
+                choices.append(f'url("{_relative_url(one["path"], base_dir)}") type("{mime}") 1x')
+                choices.append(f'url("{_relative_url(two["path"], base_dir)}") type("{mime}") 2x')
+            else:
+                choices.append(f'url("{_relative_url(one["path"], base_dir)}") type("{mime}")')
+        return 'image-set(' + ', '.join(choices) + ')'
+
+    def fallback_url(match, width):
+        target, _ = _resolve(match.group(3), base_dir)
+        image = images.get(target)
+        if not image or not width:
+            return match.group(0)
+        chosen = pick(candidates(image, target, image['type']), width)
+        return f'url("{_relative_url(chosen["path"], base_dir)}")'
+
+    def upgrade(text, width=None):
+        def replace(match):
+            value = match.group(4)
+            upgraded = CSS_REF.sub(lambda m: image_set(m, width), value)
+            if upgraded == value:
+                return match.group(0)
+            plain = CSS_REF.sub(lambda m: fallback_url(m, width), value)
+            # Browsers without image-set() drop the second declaration and keep the first
+            return (match.group(1) + match.group(2) + match.group(3) + plain + ';'
+                    + match.group(2) + match.group(3) + upgraded)
+        return CSS_DECLARATION.sub(replace, text)
+
+    # Declarations of top-level rules using a responsive image, with the smaller widths they have
+    media_rules = {}  # max-width -> rules
+    for match in CSS_DECLARATION.finditer(css):
+        widths = set()
+        for ref in CSS_REF.finditer(match.group(4)):
+            image = images.get(_resolve(ref.group(3), base_dir)[0])
+            if image:
+                widths.update(v['width'] for v in image['variants'] if v['width'] < image['width'])
+        selector = _rule_selector(css, match.start()) if widths else None
+        if not selector:
+            continue
+        # The declaration and the same property's longhands after it, which it would otherwise reset
+        prop = match.group(2)
+        rest = css[match.end():css.find('}', match.end())]
+        longhands = [f"{name}: {value.strip()}" for name, value in CSS_PLAIN_DECLARATION.findall(rest)
+                     if name.startswith(prop + '-')]
+        block = '{ ' + '; '.join([f"{prop}: {match.group(4).strip()}"] + longhands) + ' }'
+        for width in widths:
+            media_rules.setdefault(width, []).append(f"{selector} {upgrade(block, width)}")
+
+    css = upgrade(css)
+    # Widest first, so the narrowest matching query is the one that wins
+    for width in sorted(media_rules, reverse=True):
+        css += f"\n@media (max-width: {width}px) {{\n" + '\n'.join(media_rules[width]) + "\n}\n"
+    return css
+
+# -- Build -------------------------------------------------------------------
+
+def collect_sources(root):
+    sources = set()
+    for pattern in SITE_PATTERNS:
+        for path in root.glob(pattern):
+            if path.is_file() and path.suffix.lower() != '.md':
+                sources.add(path.relative_to(root).as_posix())
+    return sorted(sources)
+
+def file_kind(rel_path):
+    suffix = Path(rel_path).suffix.lower()
+    if suffix == '.html':
+        return 'html'
+    if rel_path.startswith('data/'):
+        return 'data'
+    if suffix in HASHED_SUFFIXES:
+        return suffix.lstrip('.') if suffix in ('.css', '.js') else 'asset'
+    return 'copy'
+
+def hashed_name(rel_path, content):
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    path = Path(rel_path)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+def _write_output(output_dir, rel_path, content):
+    target = output_dir / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp = target.with_name(target.name + '.tmp')
+    temp.write_bytes(content)
+    os.replace(temp, target)
+
+def _publish_variants(output_dir, rel_path, raw, image_cache):
+    """Write an image's responsive variants; returns (image info, variants) or (None, [])"""
+    try:
+        variants = image_variants(raw, image_cache)
+        with Image.open(io.BytesIO(raw)) as source:
+            width, height = ImageOps.exif_transpose(source).size
+            mime = Image.MIME.get(source.format, 'application/octet-stream')
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not resize {rel_path}: {e}")
+        return None, []
+    if not variants:
+        return None, []
+
+    path = Path(rel_path)
+    published = []
+    for variant_width, fmt, data in variants:
+        variant_mime, suffix = IMAGE_TYPES[fmt]
+        output = hashed_name(path.with_name(f"{path.stem}-{variant_width}w{suffix}").as_posix(), data)
+        _write_output(output_dir, output, data)
+        published.append({'path': output, 'width': variant_width, 'type': variant_mime, 'bytes': len(data)})
+    info = {'width': width, 'height': height, 'type': mime,
+            'modernTypes': [IMAGE_TYPES[fmt][0] for fmt in modern_formats()]}
+    return info, published
+
+def _read_cache(output_dir):
+    try:
+        return json.loads((output_dir / CACHE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def load_cache(output_dir):
+    cache = _read_cache(output_dir)
+    return cache.get('files', {}) if cache.get('version') == BUILD_VERSION else {}
+
+def previous_outputs(output_dir):
+    """Every file the last build wrote (whatever its version), the only files a build may prune"""
+    paths = set()
+    for entry in _read_cache(output_dir).get('files', {}).values():
+        paths.add(entry['output'])
+        paths.update(v['path'] for v in entry.get('variants', []))
+    return paths
+
+def _remove_outputs(output_dir, paths):
+    """Delete the given build outputs and any directories they leave empty; returns how many were removed"""
+    removed = 0
+    for rel in sorted(paths):
+        path = output_dir / rel
+        if not path.is_file():
+            continue
+        path.unlink()
+        removed += 1
+        parent = path.parent
+        while parent != output_dir and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+def clean(output_dir):
+    """Remove what earlier builds wrote, leaving anything else in the directory (and the cache file that marks it)"""
+    output_dir = Path(output_dir)
+    check_output_dir(output_dir)
+    _remove_outputs(output_dir, previous_outputs(output_dir) | {MANIFEST_FILE})
+
+def check_output_dir(output_dir):
+    """Refuse to build into a non-empty directory that no earlier build created"""
+    if output_dir.is_dir() and not (output_dir / CACHE_FILE).exists() and any(output_dir.iterdir()):
+        raise FileExistsError(f"{output_dir} is not empty and has no {CACHE_FILE} - "
+                              f"pick an empty or previously built output directory")
+
+def build(root=REPO_ROOT, output_dir=DEFAULT_OUTPUT, minify=True, force=False, images=True,
+          image_cache=DEFAULT_IMAGE_CACHE):
+    """Build the site into output_dir; returns the manifest (published name per source, image variants)"""
+    root = Path(root)
+    output_dir = Path(output_dir)
+    check_output_dir(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    previous = previous_outputs(output_dir)
+    cache = {} if force else load_cache(output_dir)
+    new_cache = {}
+    outputs = {}
+    responsive = {}
+    built = reused = 0
+    if images and Image is None:
+        print("⚠️  Pillow not installed - images are copied as-is (pip install Pillow for responsive variants)")
+        images = False
+    image_settings = [IMAGE_VERSION, modern_formats()] if images else None
+
+    sources = collect_sources(root)
+    # Referenced files first, so pages can be rewritten to their hashed names
+    order = {'asset': 0, 'js': 0, 'copy': 0, 'data': 0, 'css': 1, 'html': 2}
+    for rel_path in sorted(sources, key=lambda p: (order[file_kind(p)], p)):
+        kind = file_kind(rel_path)
+        raw = (root / rel_path).read_bytes()
+        base_dir = os.path.dirname(rel_path)
+        is_image = bool(images) and Path(rel_path).suffix.lower() in IMAGE_SUFFIXES
+
+        deps = {}
+        if kind in ('css', 'html'):
+            text = raw.decode('utf-8')
+            refs = find_refs(text, CSS_REF, base_dir)
+            if kind == 'html':
+                refs |= find_refs(text, HTML_REF, base_dir)
+            deps = {ref: [outputs[ref], responsive.get(ref)] for ref in sorted(refs) if ref in outputs}
+
+        settings = [minify, deps, image_settings if is_image or kind in ('css', 'html') else None]
+        key = hashlib.sha256(raw + json.dumps(settings, sort_keys=True).encode()).hexdigest()
+        cached = cache.get(rel_path)
+        if cached and cached['key'] == key and all(
+            (output_dir / path).exists() for path in [cached['output']] + [v['path'] for v in cached['variants']]
+        ):
+            outputs[rel_path] = cached['output']
+            if cached['image']:
+                responsive[rel_path] = dict(cached['image'], variants=cached['variants'])
+            new_cache[rel_path] = cached
+            reused += 1
+            continue
+
+        if kind == 'css':
+            text = raw.decode('utf-8')
+            if images:
+                text = add_image_sets(text, base_dir, outputs, responsive)
+            text = rewrite_refs(text, CSS_REF, base_dir, outputs)
+            content = (minify_css(text) if minify else text).encode('utf-8')
+        elif kind == 'js':
+            text = raw.decode('utf-8')
+            content = (minify_js(text) if minify else text).encode('utf-8')
+        elif kind == 'html':
+            text = raw.decode('utf-8')
+            if images:
+                text = add_picture_sources(text, base_dir, outputs, responsive)
+            text = rewrite_refs(text, HTML_REF, base_dir, outputs)
+            rewrite_css = lambda css: rewrite_refs(css, CSS_REF, base_dir, outputs)
+            content = (minify_html(text, rewrite_css) if minify else rewrite_css(text)).encode('utf-8')
+        else:
+            content = raw
+
+        output = hashed_name(rel_path, content) if kind in ('css', 'js', 'asset') else rel_path
+        _write_output(output_dir, output, content)
+        outputs[rel_path] = output
+
+        image, variants = _publish_variants(output_dir, rel_path, raw, image_cache) if is_image else (None, [])
+        if image:
+            responsive[rel_path] = dict(image, variants=variants)
+
+        new_cache[rel_path] = {'key': key, 'output': output, 'bytes': len(raw), 'outputBytes': len(content),
+                               'image': image, 'variants': variants}
+        built += 1
+
+    manifest = {'files': dict(sorted(outputs.items())), 'images': dict(sorted(responsive.items()))}
+    (output_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2) + '\n', encoding='utf-8')
+    (output_dir / CACHE_FILE).write_text(
+        json.dumps({'version': BUILD_VERSION, 'files': new_cache}, indent=2) + '\n', encoding='utf-8'
+    )
+
+    # Remove outputs of deleted sources and superseded hashes; files the build never wrote are left alone
+    keep = set(outputs.values())
+    keep |= {v['path'] for image in responsive.values() for v in image['variants']}
+    removed = _remove_outputs(output_dir, previous - keep)
+
+    source_bytes = sum(entry['bytes'] for entry in new_cache.values())
+    output_bytes = sum(entry['outputBytes'] for entry in new_cache.values())
+    print(f"✅ Built {len(outputs)} files into {output_dir} ({built} rebuilt, {reused} unchanged, {removed} removed)")
+    if source_bytes:
+        print(f"📦 {source_bytes / 1024:.0f} KB -> {output_bytes / 1024:.0f} KB "
+              f"({1 - output_bytes / source_bytes:.0%} smaller)")
+    if responsive:
+        variant_count = sum(len(image['variants']) for image in responsive.values())
+        print(f"🖼️  {variant_count} responsive variants for {len(responsive)} images "
+              f"({', '.join(modern_formats() + ['original format'])})")
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the minified, content-hashed site into dist/')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help='output directory (default: dist/)')
+    parser.add_argument('--no-minify', dest='minify', action='store_false', help='only hash and rewrite')
+    parser.add_argument('--force', action='store_true', help='ignore the build cache and rebuild everything')
+    parser.add_argument('--clean', action='store_true', help='delete the previous build outputs first')
+    parser.add_argument('--no-images', dest='images', action='store_false',
+                        help='copy images as-is instead of generating responsive variants')
+    parser.add_argument('--image-cache', default=str(DEFAULT_IMAGE_CACHE),
+                        help='where encoded image variants are kept between builds')
+    args = parser.parse_args(argv)
+
+    output_dir = Path(args.output)
+    try:
+        if args.clean and output_dir.exists():
+            clean(output_dir)
+        build(REPO_ROOT, output_dir, minify=args.minify, force=args.force or args.clean, images=args.images,
+              image_cache=args.image_cache)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"❌ Build failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
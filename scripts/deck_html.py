@@ -0,0 +1,139 @@
+"""
+HTML backend for the generated decks
+Renders a day spec (see generate_decks.py) into the shared page template; the stylesheet and script
+are separate files shared by every day, so each page only carries its own slides (speaker notes only
+when asked for, they stay in the .pptx either way)
+"""
+
+import html
+import os
+import shutil
+from pathlib import Path
+from string import Template
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+PAGE_TEMPLATE = TEMPLATE_DIR / 'presentation.html'
+STATIC_FILES = ('deck.css', 'deck.js')
+PORTAL_PAGE = Path(__file__).resolve().parent.parent / 'PowerBI_Training_Portal.html'
+SCHEMA_TABLES = (('customers', 'CUSTOMERS'), ('products', 'PRODUCTS'), ('fact', 'SALES (Fact)'),
+                 ('calendar', 'CALENDAR'))
+
+def _escape(text):
+    return html.escape(text, quote=False)
+
+def html_filename(spec):
+    """Same names as the hand-made decks in presentations/"""
+    return f"Day_{spec['day']:02d}_Presentation.html"
+
+def portal_href(output_dir):
+    """Link from pages in output_dir back to the student portal"""
+    return Path(os.path.relpath(PORTAL_PAGE, Path(output_dir).resolve())).as_posix()
+
+def _points_html(points):
+    """Nested <ul> for points given as 'text' or ('text', level); sub-lists go inside their parent <li>"""
+    items = []  # (text, children) trees
+    for point in points:
+        text, level = tuple(point) if isinstance(point, (list, tuple)) else (point, 0)
+        siblings = items
+        for _ in range(level):
+            if not siblings:
+                siblings.append(('', []))
+            siblings = siblings[-1][1]
+        siblings.append((text, []))
+
+    # One element per line and no indentation: the pages are generated, and indenting
+    # 80+ slides costs more bytes than their markup
+    def render(nodes):
+        out = ['<ul>']
+        for text, children in nodes:
+            if children:
+                out.append(f'<li>{_escape(text)}')
+                out.extend(render(children))
+                out.append('</li>')
+            else:
+                out.append(f'<li>{_escape(text)}</li>')
+        out.append('</ul>')
+        return out
+
+    return '\n'.join(render(items))
+
+def _notes_html(notes):
+    return f'<details class="notes"><summary>Speaker notes</summary><p>{_escape(notes)}</p></details>'
+
+def _slide_html(slide_spec, notes):
+    kind = slide_spec.get('kind', 'bullets')
+    points = slide_spec.get('points', [])
+    body = []
+    if kind == 'code':
+        code = f'<pre class="code-block">{_escape(slide_spec["code"])}</pre>'
+        if points:
+            body.extend(['<div class="split">', _points_html(points), code, '</div>'])
+        else:
+            body.append(code)
+    elif kind == 'star-schema':
+        body.extend(['<div class="split">', _points_html(points), '<div class="star-schema">'])
+        body.extend(f'<div class="table {css_class}">{label}</div>' for css_class, label in SCHEMA_TABLES)
+        body.extend(['</div>', '</div>'])
+    elif points:
+        body.append(_points_html(points))
+
+    out = ['<div class="slide">',
+           f'<h2 class="slide-title">{_escape(slide_spec["title"])}</h2>',
+           '<div class="slide-content">']
+    out.extend(body)
+    out.append('</div>')
+    if notes and slide_spec.get('notes'):
+        out.append(_notes_html(slide_spec['notes']))
+    out.append('</div>')
+    return '\n'.join(out)
+
+def render_html(spec, total_days, portal='../PowerBI_Training_Portal.html', notes=False):
+    """The full page for one day spec; portal is the link back to the student portal"""
+    day = spec['day']
+    slides = ['\n'.join([
+        '<div class="slide title-slide">',
+        f'<h1 class="slide-title">{_escape(spec["title"])}</h1>',
+        f'<h2 class="slide-subtitle">{_escape(spec.get("subtitle", ""))}</h2>',
+        f'<p class="day-info">{_escape(spec.get("dayInfo", ""))}</p>',
+        '</div>',
+    ])]
+    slides.extend(_slide_html(slide_spec, notes) for slide_spec in spec['slides'])
+    closing = ['<div class="slide closing-slide">',
+               f'<h2 class="slide-title">Day {day} Complete!</h2>',
+               '<p class="slide-subtitle">Next: Complete exercises &amp; build practice model</p>']
+    if notes and spec.get('notes'):
+        closing.append(_notes_html(spec['notes']))
+    closing.append('</div>')
+    slides.append('\n'.join(closing))
+
+    nav = []
+    if day > 1:
+        nav.append(f'<a href="Day_{day - 1:02d}_Presentation.html" class="nav-btn" data-nav="prev">← Day {day - 1}</a>')
+    nav.append(f'<a href="{html.escape(portal)}" class="nav-btn" data-nav="portal">Portal</a>')
+    if day < total_days:
+        nav.append(f'<a href="Day_{day + 1:02d}_Presentation.html" class="nav-btn" data-nav="next">Day {day + 1} →</a>')
+
+    return Template(PAGE_TEMPLATE.read_text(encoding='utf-8')).substitute(
+        page_title=_escape(f"Day {day}: {spec['title']}"),
+        nav_links='\n'.join(' ' * 16 + link for link in nav),
+        slides='\n'.join(slides),
+    )
+
+def build_html(spec, output_path, total_days, notes=False):
+    """Write one day's page; returns the slide count (title and closing slides included, as in the .pptx)"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp = output_path.with_name(output_path.name + '.tmp')
+    page = render_html(spec, total_days, portal_href(output_path.parent), notes)
+    temp.write_text(page, encoding='utf-8')
+    os.replace(temp, output_path)
+    return len(spec['slides']) + 2
+
+def copy_static(output_dir):
+    """Put the shared stylesheet and script next to the pages, leaving unchanged copies alone"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name in STATIC_FILES:
+        source, target = TEMPLATE_DIR / name, output_dir / name
+        if not target.exists() or target.read_bytes() != source.read_bytes():
+            shutil.copyfile(source, target)
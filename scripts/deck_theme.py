@@ -0,0 +1,228 @@
+"""
+Theme for the generated PowerPoint decks
+Colours and text styles are defined once and written into the slide layouts and into prototype shapes;
+slides clone the prototypes, so runs carry no formatting of their own
+"""
+
+import copy
+import re
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Inches, Pt
+
+NAVY = RGBColor(0, 51, 102)
+GOLD = RGBColor(241, 197, 0)
+AMBER = RGBColor(255, 192, 0)
+BLUE = RGBColor(68, 114, 196)
+GREEN = RGBColor(0, 176, 80)
+GREY = RGBColor(89, 89, 89)
+BLACK = RGBColor(0, 0, 0)
+WHITE = RGBColor(255, 255, 255)
+CODE_BACKGROUND = RGBColor(43, 43, 43)
+CODE_BORDER = RGBColor(200, 200, 200)
+CODE_TEXT = RGBColor(230, 230, 230)
+
+# size is in points, one value per outline level when it is a tuple; align is the DrawingML value (l/ctr/r)
+TEXT_STYLES = {
+    'slide-title': {'size': 32, 'bold': True, 'color': NAVY},
+    'slide-body': {'size': (18, 18, 18), 'space_before': 6},
+    'deck-title': {'size': 54, 'bold': True, 'color': NAVY, 'align': 'ctr'},
+    'subtitle': {'size': 24, 'color': GREY, 'align': 'ctr'},
+    'day-info': {'size': 18, 'color': NAVY, 'align': 'ctr'},
+    'text': {'size': 16},
+    'callout': {'size': 18, 'bold': True},
+    'heading': {'size': 16, 'bold': True},
+    'note': {'size': 12, 'italic': True},
+    'action': {'size': 18, 'align': 'ctr'},
+    'points': {'size': (16, 14, 12), 'space_after': 6},
+    'points-small': {'size': (14, 12, 10), 'space_after': 6},
+    'points-large': {'size': 18, 'space_after': 10},
+    'code': {'size': 11, 'color': CODE_TEXT, 'font': 'Consolas'},
+    'logo': {'size': 20, 'bold': True, 'color': BLACK, 'align': 'ctr'},
+    'box-dark': {'size': 14, 'bold': True, 'color': BLACK, 'align': 'ctr'},
+    'box-light': {'size': 14, 'bold': True, 'color': WHITE, 'align': 'ctr'},
+    'label-light': {'size': 12, 'bold': True, 'color': WHITE, 'align': 'ctr'},
+    'table-dark': {'size': 12, 'color': BLACK, 'align': 'l'},
+    'table-light': {'size': 12, 'color': WHITE, 'align': 'l'},
+}
+
+# -- Text styles as list styles ----------------------------------------------
+
+def _level_xml(level, style):
+    sizes = style.get('size', ())
+    size = sizes[min(level, len(sizes) - 1)] if isinstance(sizes, tuple) else sizes
+    attrs = f' algn="{style["align"]}"' if 'align' in style else ''
+    spacing = ''
+    if 'space_before' in style:
+        spacing += f'<a:spcBef><a:spcPts val="{style["space_before"] * 100}"/></a:spcBef>'
+    if 'space_after' in style:
+        spacing += f'<a:spcAft><a:spcPts val="{style["space_after"] * 100}"/></a:spcAft>'
+    run = f' sz="{size * 100}"' if size else ''
+    run += ' b="1"' if style.get('bold') else ''
+    run += ' i="1"' if style.get('italic') else ''
+    fill = f'<a:solidFill><a:srgbClr val="{style["color"]}"/></a:solidFill>' if 'color' in style else ''
+    font = f'<a:latin typeface="{style["font"]}"/>' if 'font' in style else ''
+    tag = f'a:lvl{level + 1}pPr'
+    return f'<{tag}{attrs}>{spacing}<a:defRPr{run}>{fill}{font}</a:defRPr></{tag}>'
+
+def set_list_style(txBody, style_name):
+    """Write a TEXT_STYLES entry as the text body's <a:lstStyle> (inherited by every paragraph and run)"""
+    style = TEXT_STYLES[style_name]
+    levels = len(style['size']) if isinstance(style.get('size'), tuple) else 1
+    list_style = parse_xml(
+        f'<a:lstStyle {nsdecls("a")}>{"".join(_level_xml(i, style) for i in range(levels))}</a:lstStyle>'
+    )
+    existing = txBody.find(qn('a:lstStyle'))
+    if existing is not None:
+        txBody.replace(existing, list_style)
+    else:
+        txBody.insert(1, list_style)
+
+def apply_layout_styles(prs):
+    """Title and body formatting on the layouts the decks use, so slide placeholders need none"""
+    if getattr(prs, '_deck_theme', False):
+        return
+    for layout_index in (1, 5):
+        for placeholder in prs.slide_layouts[layout_index].placeholders:
+            idx = placeholder.placeholder_format.idx
+            if idx == 0:
+                set_list_style(placeholder._element.txBody, 'slide-title')
+            elif idx == 1 and layout_index == 1:
+                set_list_style(placeholder._element.txBody, 'slide-body')
+    prs._deck_theme = True
+
+def new_presentation():
+    """16:12 (10in x 7.5in) presentation with the theme applied to its layouts"""
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    apply_layout_styles(prs)
+    return prs
+
+# -- Prototype shapes --------------------------------------------------------
+
+# Prototype <p:sp>/<p:cxnSp> elements by style key; they reference no parts, so any slide can reuse them
+_prototypes = {}
+
+def _stamp(slide, key, make, left, top, width, height):
+    """Copy of the prototype for key (built once with make(slide)) placed at the given position"""
+    prototype = _prototypes.get(key)
+    if prototype is None:
+        shape = make(slide)
+        _prototypes[key] = copy.deepcopy(shape._element)
+    else:
+        element = copy.deepcopy(prototype)
+        shape_id = slide.shapes._next_shape_id
+        cNvPr = element._nvXxPr.cNvPr
+        cNvPr.id = shape_id
+        cNvPr.name = re.sub(r'\d+$', str(shape_id - 1), cNvPr.name)
+        slide.shapes._spTree.insert_element_before(element, 'p:extLst')
+        shape = slide.shapes._shape_factory(element)
+    shape.left, shape.top, shape.width, shape.height = left, top, width, height
+    return shape
+
+def _fill(shape, fill_color, line_color=None, outline=True):
+    """Solid fill; the outline keeps the theme's default unless it has a colour or is turned off"""
+    if fill_color is None:
+        shape.fill.background()
+    else:
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = fill_color
+    if not outline:
+        shape.line.fill.background()
+    elif line_color is not None:
+        shape.line.color.rgb = line_color
+
+def add_text(slide, style_name, left, top, width, height, text=''):
+    """Word-wrapped text box in one of the TEXT_STYLES; '\\n' starts a paragraph, '\\v' a line break"""
+    def make(slide):
+        box = slide.shapes.add_textbox(0, 0, Inches(1), Inches(1))
+        box.text_frame.word_wrap = True
+        set_list_style(box._element.txBody, style_name)
+        return box
+
+    box = _stamp(slide, ('text', style_name), make, left, top, width, height)
+    box.text_frame.text = text
+    return box
+
+def add_points(slide, style_name, left, top, width, height, points, bullets=('• ', '– ')):
+    """Text box of points; a point is 'text' or ('text', level)"""
+    box = add_text(slide, style_name, left, top, width, height)
+    frame = box.text_frame
+    for index, point in enumerate(points):
+        text, level = point if isinstance(point, tuple) else (point, 0)
+        p = frame.paragraphs[0] if index == 0 else frame.add_paragraph()
+        p.text = (bullets[min(level, len(bullets) - 1)] if bullets and text else '') + text
+        if level:
+            p.level = level
+    return box
+
+def add_box(slide, shape_type, left, top, width, height, text='', fill_color=None, style_name='box-dark',
+            line_color=None, outline=True):
+    """Filled autoshape with centred text, e.g. a table in a schema diagram"""
+    def make(slide):
+        shape = slide.shapes.add_shape(shape_type, 0, 0, Inches(1), Inches(1))
+        _fill(shape, fill_color, line_color, outline)
+        shape.text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+        set_list_style(shape._element.txBody, style_name)
+        return shape
+
+    key = ('box', int(shape_type), str(fill_color), str(line_color), outline, style_name)
+    shape = _stamp(slide, key, make, left, top, width, height)
+    if text:
+        shape.text_frame.text = text
+    return shape
+
+def add_code(slide, left, top, width, height, code):
+    """Dark rounded panel with monospaced code"""
+    def make(slide):
+        shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, 0, 0, Inches(1), Inches(1))
+        _fill(shape, CODE_BACKGROUND, CODE_BORDER)
+        frame = shape.text_frame
+        frame.word_wrap = True
+        frame.margin_left = Inches(0.2)
+        frame.margin_right = Inches(0.2)
+        frame.margin_top = Inches(0.1)
+        frame.vertical_anchor = MSO_ANCHOR.TOP
+        set_list_style(shape._element.txBody, 'code')
+        return shape
+
+    shape = _stamp(slide, ('code',), make, left, top, width, height)
+    # One paragraph with line breaks, like the original helper, so blank lines keep their height
+    shape.text_frame.text = code.replace('\n', '\v')
+    return shape
+
+def add_connector(slide, begin_x, begin_y, end_x, end_y, color=BLACK, width=2):
+    def make(slide):
+        connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, 0, 0, Inches(1), Inches(1))
+        connector.line.color.rgb = color
+        connector.line.width = Pt(width)
+        return connector
+
+    connector = _stamp(slide, ('connector', str(color), width), make, 0, 0, 0, 0)
+    connector.begin_x, connector.begin_y = begin_x, begin_y
+    connector.end_x, connector.end_y = end_x, end_y
+    return connector
+
+def add_bar(slide, left, top, width, height, color):
+    """Solid rectangle without an outline (banners, accent lines)"""
+    return add_box(slide, MSO_SHAPE.RECTANGLE, left, top, width, height, fill_color=color, outline=False)
+
+def set_title(slide, text, top=None, size=None, align=None):
+    """Fill the layout's title placeholder; formatting comes from the layout unless overridden"""
+    title = slide.shapes.title
+    if top is not None:
+        title.left, title.top, title.width, title.height = Inches(0.5), top, Inches(9), Inches(0.8)
+        title.text_frame.word_wrap = True
+    title.text_frame.text = text
+    paragraph = title.text_frame.paragraphs[0]
+    if size and paragraph.runs:
+        paragraph.runs[0].font.size = Pt(size)
+    if align is not None:
+        paragraph.alignment = align
+    return title
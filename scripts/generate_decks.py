@@ -0,0 +1,495 @@
+"""
+Deck generator for all training days
+Parses documentation/Day_XX_*.md into a day spec (the slide model) and renders it as a PowerPoint deck and an
+HTML presentation, one day per worker
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOCS_DIR = REPO_ROOT / 'documentation'
+DEFAULT_OUTPUT = REPO_ROOT / 'generated'
+# Where the student portal links the day pages; --publish writes the HTML there
+PRESENTATIONS_DIR = REPO_ROOT / 'presentations'
+TOTAL_DAYS = 12
+CACHE_FILE = '.deck-cache.json'
+FORMATS = ('pptx', 'html')
+
+# Bump when the parsing or layout changes in a way the hashed files below don't capture
+GENERATOR_VERSION = 2
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# The shared deck.css/deck.js are copied on every run and aren't part of any page, so they aren't hashed
+RENDERER_FILES = {
+    'pptx': ('generate_decks.py', 'generate_powerpoint_day01.py', 'deck_theme.py'),
+    'html': ('generate_decks.py', 'deck_html.py', 'templates/presentation.html'),
+}
+
+# How much of a lesson fits on slides; the full section text always goes into the speaker notes
+MAX_POINTS = 6
+MAX_SLIDES_PER_SECTION = 2
+MAX_POINT_CHARS = 140
+MAX_CODE_LINES = 18
+SKIPPED_SECTIONS = ('trainer notes', 'presenter notes')
+NOTE_LABELS = ('visual suggestion', 'visual', 'caption')
+
+# -- Markdown -> day spec -----------------------------------------------------
+
+HEADING = re.compile(r'^(#{1,3})\s+(.*?)\s*#*$')
+BULLET = re.compile(r'^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$')
+LABEL = re.compile(r'^\*\*([^*]+?):?\*\*:?\s*(.*)$')
+
+def clean_text(text):
+    """Plain slide text: no markdown emphasis, links or code ticks"""
+    text = re.sub(r'\[([^\]]+)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'(\*\*|__|`)', '', text)
+    text = re.sub(r'(?<!\w)\*(?!\s)([^*]+)\*', r'\1', text)
+    return text.strip()
+
+def clean_heading(text):
+    """Drop numbering emoji such as 1️⃣ / ❌ and 'SLIDE 3:' prefixes"""
+    text = re.sub(r'^\d️?⃣\s*', '', clean_text(text))
+    text = re.sub(r'^[^\w("\'$]+', '', text)
+    return re.sub(r'^SLIDE\s+\d+:\s*', '', text, flags=re.I).strip()
+
+SENTENCE_END = re.compile(r'(?<!\bvs\.)(?<!\be\.g\.)(?<!\bi\.e\.)(?<=[.!?])\s+(?=[A-Z"\'(])')
+
+def shorten(text, limit=MAX_POINT_CHARS, first_sentence=True):
+    """First sentence (of a paragraph), cut at a word boundary if it is still too long"""
+    sentence = SENTENCE_END.split(text, maxsplit=1)[0] if first_sentence else text
+    if len(sentence) <= limit:
+        return sentence
+    return sentence[:limit].rsplit(' ', 1)[0] + '…'
+
+def split_sections(markdown):
+    """[(level, heading, body lines)] for every #/##/### heading, code fences left intact"""
+    sections = []
+    current = (0, '', [])
+    in_code = False
+    for line in markdown.splitlines():
+        if line.lstrip().startswith('```'):
+            in_code = not in_code
+        match = None if in_code else HEADING.match(line)
+        if match:
+            sections.append(current)
+            current = (len(match.group(1)), match.group(2), [])
+        else:
+            current[2].append(line)
+    sections.append(current)
+    return [s for s in sections if s[1] or any(line.strip() for line in s[2])]
+
+def parse_block(lines):
+    """Points, code blocks, notes and labelled fields from one slide's worth of markdown"""
+    points, code_blocks, notes, fields = [], [], [], {}
+    code = None
+    under_label = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            if code is None:
+                code = []
+            else:
+                code_blocks.append('\n'.join(code).rstrip())
+                code = None
+            continue
+        if code is not None:
+            code.append(line.rstrip())
+            continue
+        if not stripped or stripped == '---' or stripped.startswith(('|', '>', '<')):
+            continue
+
+        label = LABEL.match(stripped)
+        bullet = BULLET.match(line)
+        if label:
+            name, value = label.group(1).strip(), clean_text(label.group(2))
+            key = name.lower()
+            fields[key] = value
+            if key in NOTE_LABELS:
+                notes.append(f"{name}: {value}")
+            elif key != 'title':
+                points.append((shorten(f"{name}: {value}" if value else name), 0))
+                under_label = not value
+        elif bullet:
+            indent = len(bullet.group(1).expandtabs(4)) // 2
+            level = min(indent + (1 if under_label else 0), 2)
+            points.append((shorten(clean_text(bullet.group(2)), first_sentence=False), level))
+        else:
+            points.append((shorten(clean_text(stripped)), 0))
+            under_label = False
+    if code is not None:
+        code_blocks.append('\n'.join(code).rstrip())
+    return points, code_blocks, notes, fields
+
+def _section_slides(title, lines):
+    """One section (### or a ## without subsections) as one or more slides"""
+    points, code_blocks, notes, fields = parse_block(lines)
+    title = fields.get('title') or title
+    full_notes = '\n'.join(notes + [clean_text(line.rstrip()) for line in lines if line.strip() not in ('', '---')])
+    slides = []
+    # A couple of extra points are better squeezed in than moved to a near-empty slide
+    per_slide = len(points) if 0 < len(points) <= MAX_POINTS + 2 else MAX_POINTS
+    chunks = [points[i:i + per_slide] for i in range(0, len(points), per_slide)] or [[]]
+    for index in range(min(MAX_SLIDES_PER_SECTION, max(len(chunks), len(code_blocks)))):
+        slide = {
+            'kind': 'bullets',
+            'title': title if index == 0 else f"{title} (cont.)",
+            'points': chunks[index] if index < len(chunks) else [],
+            'notes': full_notes if index == 0 else '',
+        }
+        if index < len(code_blocks):
+            slide['kind'] = 'code'
+            slide['points'] = slide['points'][:MAX_POINTS - 1]
+            slide['code'] = '\n'.join(code_blocks[index].splitlines()[:MAX_CODE_LINES])
+        if re.search(r'star schema', title, re.I) and index == 0 and not code_blocks:
+            slide['kind'] = 'star-schema'
+        if slide['points'] or slide.get('code'):
+            slides.append(slide)
+    return slides
+
+def parse_day_markdown(markdown, day_number):
+    """Day spec (title, subtitle and slide list) from a lesson or slide-content markdown file"""
+    sections = split_sections(markdown)
+    title = f"Day {day_number}"
+    for level, heading, _ in sections:
+        if level == 1:
+            title = re.sub(r'^DAY\s+\d+\s*[-–:]\s*', '', clean_heading(heading), flags=re.I)
+            break
+
+    subtitle = ''
+    module = ''
+    slides = []
+    deck_notes = []
+    parent = ''
+    for level, heading, lines in sections:
+        name = clean_heading(heading)
+        if level == 2:
+            parent = name
+        if level not in (2, 3):
+            continue
+        if parent.lower().startswith(SKIPPED_SECTIONS):
+            deck_notes.extend(line for line in lines if line.strip())
+            continue
+        if re.match(r'title slide$', name, re.I):
+            _, _, _, fields = parse_block(lines)
+            title = fields.get('title', title)
+            subtitle = fields.get('subtitle', subtitle)
+            module = fields.get('module', module)
+            continue
+        if level == 2 and name.lower().startswith('session overview') and not subtitle:
+            paragraph = next((line.strip() for line in lines if line.strip()), '')
+            subtitle = shorten(clean_text(paragraph), 90)
+        slides.extend(_section_slides(name, lines))
+
+    day_info = f"Day {day_number} of {TOTAL_DAYS}" + (f" | Module {module}" if module else '')
+    return {
+        'day': day_number,
+        'title': title,
+        'subtitle': subtitle,
+        'dayInfo': day_info,
+        'slides': slides,
+        'notes': '\n'.join(deck_notes),
+    }
+
+def find_day_source(day_number, docs_dir=DOCS_DIR):
+    """Curated slide content if there is any (Day_01_PowerPoint_Slides_Content.md), else the lesson notes"""
+    prefix = f"Day_{day_number:02d}_"
+    spec = sorted(docs_dir.glob(f"{prefix}*.json"))
+    if spec:
+        return spec[0]
+    curated = sorted(docs_dir.glob(f"{prefix}PowerPoint_Slides_Content.md"))
+    if curated:
+        return curated[0]
+    lessons = sorted(p for p in docs_dir.glob(f"{prefix}*.md") if 'PowerPoint' not in p.name)
+    return lessons[0] if lessons else None
+
+def load_day_spec(day_number, source=None, docs_dir=DOCS_DIR):
+    """Day spec from a structured .json file or parsed from markdown"""
+    source = Path(source) if source else find_day_source(day_number, docs_dir)
+    if source is None:
+        raise FileNotFoundError(f"No documentation found for Day {day_number}")
+    if source.suffix == '.json':
+        spec = json.loads(source.read_text(encoding='utf-8'))
+    else:
+        spec = parse_day_markdown(source.read_text(encoding='utf-8'), day_number)
+    spec.setdefault('day', day_number)
+    spec['source'] = source.relative_to(REPO_ROOT).as_posix() if source.is_relative_to(REPO_ROOT) else str(source)
+    return spec
+
+def deck_filename(spec):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', spec['title']).strip('_')
+    return f"PowerBI_Day{spec['day']:02d}_{slug}.pptx"
+
+# -- Rendering ---------------------------------------------------------------
+
+def build_deck(spec, output_path):
+    """Render one day spec to a .pptx with the Day 1 helpers; returns the slide count"""
+    import deck_theme as theme
+    import generate_powerpoint_day01 as helpers
+
+    prs = theme.new_presentation()
+
+    helpers.create_title_slide(prs, spec['title'], spec.get('subtitle', ''), spec.get('dayInfo', ''))
+    for slide_spec in spec['slides']:
+        points = [tuple(p) if isinstance(p, list) else p for p in slide_spec.get('points', [])]
+        kind = slide_spec.get('kind', 'bullets')
+        if kind == 'code':
+            slide = create_code_slide(prs, helpers, slide_spec['title'], points, slide_spec['code'])
+        elif kind == 'star-schema':
+            slide = create_diagram_slide(prs, helpers, slide_spec['title'], points)
+        else:
+            helpers.create_content_slide(prs, slide_spec['title'], points)
+            slide = prs.slides[-1]
+        if slide_spec.get('notes'):
+            slide.notes_slide.notes_text_frame.text = slide_spec['notes']
+
+    closing = create_closing_slide(prs, spec['day'])
+    if spec.get('notes'):
+        closing.notes_slide.notes_text_frame.text = spec['notes']
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp = output_path.with_name(output_path.name + '.tmp')
+    prs.save(str(temp))
+    os.replace(temp, output_path)
+    return len(prs.slides)
+
+def create_code_slide(prs, helpers, title_text, points, code):
+    """Points on the left, DAX/M code block on the right (like the Day 1 summary slide)"""
+    import deck_theme as theme
+    from pptx.util import Inches
+
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    theme.set_title(slide, title_text, Inches(0.4), size=28)
+    if points:
+        theme.add_points(slide, 'points-small', Inches(0.5), Inches(1.4), Inches(4.3), Inches(5.2), points)
+        helpers.add_code_block(slide, Inches(5.0), Inches(1.4), Inches(4.6), Inches(5.2), code)
+    else:
+        helpers.add_code_block(slide, Inches(0.5), Inches(1.4), Inches(9), Inches(5.2), code)
+    return slide
+
+def create_diagram_slide(prs, helpers, title_text, points):
+    """Star schema diagram with the slide's points beside it"""
+    import deck_theme as theme
+    from pptx.util import Inches
+
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    theme.set_title(slide, title_text, Inches(0.5))
+    helpers.create_star_schema_diagram(slide, Inches(6.2), Inches(3.8))
+    theme.add_points(slide, 'points', Inches(0.5), Inches(1.6), Inches(3.4), Inches(5), points)
+    return slide
+
+def create_closing_slide(prs, day_number):
+    import deck_theme as theme
+    from pptx.util import Inches
+    from pptx.enum.text import PP_ALIGN
+
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    theme.set_title(slide, f"Day {day_number} Complete!", Inches(2.5), size=44, align=PP_ALIGN.CENTER)
+    theme.add_text(slide, 'action', Inches(2), Inches(4), Inches(6), Inches(2),
+                   "Next: Complete exercises & build practice model")
+    return slide
+
+def html_dir(output_dir, publish=False):
+    """Folder the HTML pages go to: output_dir/html/, or presentations/ when publishing"""
+    return PRESENTATIONS_DIR if publish else Path(output_dir) / 'html'
+
+def render(fmt, spec, output_dir, publish=False, notes=False):
+    """Render a day spec with one backend into output_dir/<fmt>/ (HTML: see html_dir);
+    returns (path relative to output_dir, slides)"""
+    if fmt == 'html':
+        import deck_html
+        path = html_dir(output_dir, publish) / deck_html.html_filename(spec)
+        slide_count = deck_html.build_html(spec, path, TOTAL_DAYS, notes)
+    else:
+        path = Path(output_dir) / 'pptx' / deck_filename(spec)
+        slide_count = build_deck(spec, path)
+    return Path(os.path.relpath(path, output_dir)).as_posix(), slide_count
+
+def build_day(day_number, output_dir, source=None, formats=FORMATS, publish=False, notes=False):
+    """Worker: parse one day once and render it in each format; returns (day, {fmt: path}, slides, seconds, hashes)"""
+    start = time.perf_counter()
+    spec = load_day_spec(day_number, source)
+    outputs = {}
+    slide_count = 0
+    for fmt in formats:
+        outputs[fmt], slide_count = render(fmt, spec, output_dir, publish, notes)
+    return day_number, outputs, slide_count, time.perf_counter() - start, slide_hashes(spec)
+
+# -- Build cache -------------------------------------------------------------
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def renderer_hash(fmt='pptx', options=None):
+    """Generator version, render options and the code that lays slides out; a change here rebuilds every deck
+    in that format"""
+    digest = hashlib.sha256(f'{GENERATOR_VERSION}:{fmt}:{json.dumps(options, sort_keys=True)}'.encode())
+    for name in RENDERER_FILES[fmt]:
+        digest.update((SCRIPTS_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+def deck_key(source, renderer=None):
+    """Cache key for one deck: its source document and the renderer"""
+    return _sha256(Path(source).read_bytes() + (renderer or renderer_hash()).encode())
+
+def cache_entry_name(day, fmt):
+    return f"{fmt}/{day}"
+
+def slide_hashes(spec):
+    """Per-slide content hashes, so a rebuild can report which slides actually changed"""
+    return [_sha256(json.dumps(slide, sort_keys=True, ensure_ascii=False).encode())[:16] for slide in spec['slides']]
+
+def changed_slides(old_hashes, new_hashes):
+    return sum(1 for i, h in enumerate(new_hashes) if i >= len(old_hashes) or old_hashes[i] != h)
+
+def load_cache(output_dir):
+    try:
+        cache = json.loads((Path(output_dir) / CACHE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return cache.get('decks', {}) if cache.get('version') == GENERATOR_VERSION else {}
+
+def save_cache(output_dir, decks):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / CACHE_FILE).write_text(
+        json.dumps({'version': GENERATOR_VERSION, 'decks': decks}, indent=2, sort_keys=True) + '\n', encoding='utf-8'
+    )
+
+def is_current(entry, key, output_dir):
+    """True when the cached deck was built from the same key and is still on disk"""
+    return bool(entry) and entry.get('key') == key and (Path(output_dir) / entry['output']).exists()
+
+# -- CLI ---------------------------------------------------------------------
+
+def parse_days(spec):
+    """'1,3,5-8' -> [1, 3, 5, 6, 7, 8]"""
+    days = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = (int(x) for x in part.split('-', 1))
+            days.update(range(first, last + 1))
+        else:
+            days.add(int(part))
+    invalid = [d for d in days if not 1 <= d <= TOTAL_DAYS]
+    if invalid:
+        raise ValueError(f"Days must be between 1 and {TOTAL_DAYS}: {invalid}")
+    return sorted(days)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate PowerPoint decks and HTML presentations from the day documentation')
+    parser.add_argument('days', nargs='?', default=f'1-{TOTAL_DAYS}',
+                        help=f'days to build, e.g. 3 or 1,2,5-8 (default: all {TOTAL_DAYS})')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT),
+                        help='output folder; decks go to its pptx/ and html/ subfolders and it keeps the '
+                             'build cache (default: generated/)')
+    parser.add_argument('--format', choices=FORMATS + ('all',), default='all',
+                        help='which renderings to build (default: all)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='parallel worker processes (default: one per CPU)')
+    parser.add_argument('--spec', help='build one day from this structured .json spec instead of markdown')
+    parser.add_argument('--dump-spec', action='store_true',
+                        help='print the parsed day spec as JSON (a starting point for --spec) and exit')
+    parser.add_argument('--force', action='store_true', help='ignore the build cache and rebuild every deck')
+    parser.add_argument('--publish', action='store_true',
+                        help='write the HTML pages into presentations/ (linked from the student portal) '
+                             'instead of <output>/html/')
+    parser.add_argument('--notes', action='store_true',
+                        help='include speaker notes in the HTML pages (the .pptx always has them)')
+    args = parser.parse_args(argv)
+
+    try:
+        days = parse_days(args.days)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.spec and len(days) != 1:
+        print("❌ --spec builds a single day; pass its number, e.g. 3 --spec day03.json")
+        return 1
+
+    if args.dump_spec:
+        specs = [load_day_spec(day, args.spec) for day in days]
+        print(json.dumps(specs[0] if len(specs) == 1 else specs, indent=2, ensure_ascii=False))
+        return 0
+
+    formats = FORMATS if args.format == 'all' else (args.format,)
+    output_dir = Path(args.output)
+    cache = {} if args.force else load_cache(output_dir)
+    decks = load_cache(output_dir)
+    html_options = {'notes': args.notes, 'publish': args.publish}
+    renderers = {fmt: renderer_hash(fmt, html_options if fmt == 'html' else None) for fmt in formats}
+    keys = {}
+    stale = {}
+    for day in days:
+        source = Path(args.spec) if args.spec else find_day_source(day)
+        for fmt in formats:
+            name = cache_entry_name(day, fmt)
+            keys[name] = deck_key(source, renderers[fmt]) if source is not None and source.exists() else None
+            entry = cache.get(name)
+            if is_current(entry, keys[name], output_dir):
+                print(f"• Day {day:2d}: unchanged ({entry['slides']} slides) -> {output_dir / entry['output']}")
+            else:
+                stale.setdefault(day, []).append(fmt)
+
+    start = time.perf_counter()
+    failures = 0
+    built = 0
+    if stale:
+        print(f"Generating {sum(map(len, stale.values()))} deck(s) for {len(stale)} day(s) "
+              f"with {min(args.jobs, len(stale))} worker(s)...")
+        with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(stale)))) as pool:
+            futures = {pool.submit(build_day, day, output_dir, args.spec, tuple(day_formats),
+                                   args.publish, args.notes): day
+                       for day, day_formats in stale.items()}
+            for future in as_completed(futures):
+                day = futures[future]
+                try:
+                    _, outputs, slide_count, seconds, hashes = future.result()
+                except ImportError:
+                    print("❌ Error: python-pptx not found")
+                    print("Install: pip install python-pptx (or build only the HTML with --format html)")
+                    return 1
+                except Exception as e:
+                    failures += len(stale[day])
+                    for fmt in stale[day]:
+                        decks.pop(cache_entry_name(day, fmt), None)
+                    print(f"❌ Day {day}: {e}")
+                    continue
+                changed = ''
+                for fmt, output in outputs.items():
+                    name = cache_entry_name(day, fmt)
+                    previous = decks.get(name, {})
+                    # A renamed deck replaces the old file; a page left behind in another folder
+                    # (html/ vs presentations/) may be the one the portal links, so it stays
+                    if (previous.get('output') not in (None, output)
+                            and os.path.dirname(previous['output']) == os.path.dirname(output)):
+                        (output_dir / previous['output']).unlink(missing_ok=True)
+                    if previous:
+                        changed = f" ({changed_slides(previous.get('slideHashes', []), hashes)} changed)"
+                    decks[name] = {'key': keys[name], 'output': output, 'slides': slide_count, 'slideHashes': hashes}
+                built += len(outputs)
+                paths = ', '.join(str(output_dir / output) for output in outputs.values())
+                print(f"✓ Day {day:2d}: {slide_count} slides{changed} in {seconds:.1f}s -> {paths}")
+        save_cache(output_dir, decks)
+
+    if 'html' in formats:
+        import deck_html
+        deck_html.copy_static(html_dir(output_dir, args.publish))
+
+    total = len(days) * len(formats)
+    print(f"\n✅ {built} deck(s) built, {total - built - failures} unchanged "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
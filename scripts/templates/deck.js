@@ -0,0 +1,39 @@
+// Keyboard navigation for the generated day presentations: arrows/PageUp/PageDown/Home/End move between slides
+(function() {
+    const slides = Array.from(document.querySelectorAll('.slide'));
+    const counter = document.querySelector('.slide-counter');
+    if (!slides.length) return;
+
+    let current = 0;
+
+    function show(index) {
+        current = Math.max(0, Math.min(slides.length - 1, index));
+        slides[current].scrollIntoView({ behavior: 'smooth', block: 'start' });
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                current = slides.indexOf(entry.target);
+                if (counter) counter.textContent = (current + 1) + ' / ' + slides.length;
+            }
+        });
+    }, { threshold: 0.5 });
+    slides.forEach(slide => observer.observe(slide));
+
+    document.addEventListener('keydown', event => {
+        if (event.target.closest('input, textarea, summary')) return;
+        if (['ArrowRight', 'ArrowDown', 'PageDown', ' '].includes(event.key)) {
+            show(current + 1);
+        } else if (['ArrowLeft', 'ArrowUp', 'PageUp'].includes(event.key)) {
+            show(current - 1);
+        } else if (event.key === 'Home') {
+            show(0);
+        } else if (event.key === 'End') {
+            show(slides.length - 1);
+        } else {
+            return;
+        }
+        event.preventDefault();
+    });
+})();
@@ -2,47 +2,993 @@
 Simple HTTP Server for Power BI Training Presentation
 Serves the training portal locally on http://localhost:8000
 """
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
+import io
+import json
+import re
 import socketserver
+import threading
+import time
 import webbrowser
 import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, unquote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
 # Configuration
 PORT = 8000
 DIRECTORY = Path(__file__).parent
+DEFAULT_WORKERS = 32
+DEFAULT_BACKLOG = 128
+RECORDINGS_PREFIX = '/recordings/'
+
+# Cache-Control by path prefix (first match wins); everything else is revalidated on each use
+NO_STORE = 'no-store, no-cache, must-revalidate'
+CACHE_POLICIES = [
+    ('assets/', 'public, max-age=31536000, immutable'),
+    ('data/', 'no-cache'),
+    ('recordings/', 'public, max-age=86400'),
+]
+DEFAULT_CACHE_POLICY = 'no-cache'
+
+# Files larger than this get a size/mtime ETag instead of a content hash (no full read of a video)
+HASH_ETAG_MAX_BYTES = 32 * 1024 * 1024
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class ETagCache:
+    """Strong ETags (content hashes) remembered per path until the file's mtime/size change"""
+
+    def __init__(self):
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, st):
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._etags.get(path)
+            if cached and cached[0] == key:
+                return cached[1]
+        if st.st_size > HASH_ETAG_MAX_BYTES:
+            return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        etag = f'"{digest.hexdigest()[:20]}"'
+        with self._lock:
+            self._etags[path] = (key, etag)
+        return etag
+
+# In-memory file cache limits and what is worth compressing
+FILE_CACHE_BYTES = 64 * 1024 * 1024
+FILE_CACHE_ENTRY_BYTES = 2 * 1024 * 1024
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+def is_compressible(content_type):
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+class FileCache:
+    """Bounded LRU of file bodies (raw and pre-compressed) keyed by path, encoding and mtime
+
+    Only text-like files are cached. Files larger than max_entry_bytes are never held
+    in memory; the handler streams them, like binary assets, from disk with sendfile.
+    """
+
+    def __init__(self, max_bytes=FILE_CACHE_BYTES, max_entry_bytes=FILE_CACHE_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, st, encoding='identity'):
+        """Body for path in the given encoding, or None if the file is too large to cache"""
+        if st.st_size > self.max_entry_bytes:
+            return None
+        key = (path, encoding)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        if encoding == 'gzip':
+            body = gzip.compress(body, compresslevel=9, mtime=0)
+        elif encoding == 'br':
+            body = brotli.compress(body, quality=11)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.size -= len(previous[1])
+            self._entries[key] = (stamp, body)
+            self.size += len(body)
+            while self.size > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return body
+
+    def warm(self, root, patterns=('*.html', 'presentations/*.html', 'assets/**/*.css', 'assets/**/*.js')):
+        """Pre-compress the usual first-load files so the first trainee doesn't pay for it"""
+        root = Path(root)
+        for pattern in patterns:
+            for file_path in root.glob(pattern):
+                st = file_path.stat()
+                self.get(str(file_path), st)
+                if st.st_size >= MIN_COMPRESS_BYTES:
+                    for encoding in SUPPORTED_ENCODINGS:
+                        self.get(str(file_path), st, encoding)
+
+# Files pushed to portals over /events: file name -> (event name, key field)
+LIVE_FILES = {
+    'training_days.json': ('days', 'dayNumber'),
+    'recordings.json': ('recordings', 'recordingId'),
+}
+EVENTS_PATH = '/events'
+
+class LiveUpdates:
+    """Watches the data files and pushes what changed to every open portal (Server-Sent Events)
+
+    One background thread polls the files and writes each event to all subscribed
+    sockets, so connected portals don't occupy request workers.
+    """
+
+    def __init__(self, watch_dir, interval=1.0, heartbeat=15.0):
+        self.watch_dir = Path(watch_dir)
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self._clients = []
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        for name in LIVE_FILES:
+            self._snapshots[name] = self._read(name)
+        self._thread = threading.Thread(target=self._run, name='live-updates', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for sock in clients:
+            self._close(sock)
+
+    def add_client(self, sock):
+        """Take ownership of an SSE connection whose response headers were already sent"""
+        sock.settimeout(5)
+        try:
+            sock.sendall(b'retry: 3000\n\n')
+        except OSError:
+            self._close(sock)
+            return
+        with self._lock:
+            self._clients.append(sock)
+
+    def publish(self, event, payload):
+        self._broadcast(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode('utf-8'))
+
+    def _broadcast(self, message):
+        with self._lock:
+            clients = list(self._clients)
+        dead = []
+        for sock in clients:
+            try:
+                sock.sendall(message)
+            except OSError:
+                dead.append(sock)
+        if dead:
+            with self._lock:
+                self._clients = [sock for sock in self._clients if sock not in dead]
+            for sock in dead:
+                self._close(sock)
+
+    def _run(self):
+        since_heartbeat = 0.0
+        while not self._stop.wait(self.interval):
+            for name in LIVE_FILES:
+                self._check(name)
+            since_heartbeat += self.interval
+            if since_heartbeat >= self.heartbeat:
+                self._broadcast(b': ping\n\n')
+                since_heartbeat = 0.0
+
+    def _read(self, name):
+        path = self.watch_dir / name
+        try:
+            st = path.stat()
+            with open(path, 'rb') as f:
+                return (st.st_mtime_ns, st.st_size), json.load(f)
+        except (OSError, ValueError):
+            return None, None
+
+    def _check(self, name):
+        previous_stamp, previous = self._snapshots.get(name, (None, None))
+        try:
+            st = (self.watch_dir / name).stat()
+            if (st.st_mtime_ns, st.st_size) == previous_stamp:
+                return
+        except OSError:
+            return
+        stamp, current = self._read(name)
+        if current is None:
+            # Probably caught mid-write; try again on the next tick
+            return
+        self._snapshots[name] = (stamp, current)
+        event, key = LIVE_FILES[name]
+        changed, removed = self._diff(previous or [], current, key)
+        if changed or removed:
+            self.publish(event, {'changed': changed, 'removed': removed})
+
+    @staticmethod
+    def _diff(old, new, key):
+        old_by_key = {item.get(key): item for item in old}
+        new_keys = {item.get(key) for item in new}
+        changed = [item for item in new if old_by_key.get(item.get(key)) != item]
+        removed = [k for k in old_by_key if k not in new_keys]
+        return changed, removed
+
+    @staticmethod
+    def _close(sock):
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+API_DAY_PATH = re.compile(r'^/api/days/(\d+)$')
+METRICS_PATH = '/metrics'
+
+# Request latency histogram buckets (seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RouteStats:
+    """Latency histogram and counters for one route"""
+
+    __slots__ = ('count', 'errors', 'bytes', 'latency_sum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def quantile(self, q):
+        """Estimate a latency quantile by interpolating inside the histogram bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if seen + self.buckets[i] >= rank:
+                inside = self.buckets[i]
+                return lower + (upper - lower) * ((rank - seen) / inside if inside else 0)
+            seen += self.buckets[i]
+            lower = upper
+        return LATENCY_BUCKETS[-1]
+
+class ServerMetrics:
+    """Per-route latency histograms, bytes served, cache hits and connection gauges"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.routes = {}
+        self.statuses = {}
+        self.not_modified = 0
+        self.active_connections = 0
+        self._lock = threading.Lock()
+
+    def connection_opened(self):
+        with self._lock:
+            self.active_connections += 1
+
+    def connection_closed(self):
+        with self._lock:
+            self.active_connections -= 1
+
+    def observe(self, route, status, seconds, size):
+        with self._lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+            stats.count += 1
+            stats.errors += status >= 400
+            stats.bytes += size
+            stats.latency_sum += seconds
+            for i, upper in enumerate(LATENCY_BUCKETS):
+                if seconds <= upper:
+                    stats.buckets[i] += 1
+                    break
+            else:
+                stats.buckets[-1] += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.not_modified += status == 304
+
+    @property
+    def total_requests(self):
+        return sum(self.statuses.values())
+
+    def cache_hit_ratio(self, file_cache=None):
+        """Share of requests answered without sending a body from disk (304s and memory hits)"""
+        total = self.total_requests
+        hits = self.not_modified + (file_cache.hits if file_cache else 0)
+        return min(hits / total, 1.0) if total else 0.0
+
+    def render_prometheus(self, file_cache=None, live_clients=0):
+        """Exposition in the Prometheus text format"""
+        with self._lock:
+            routes = {route: (s.count, s.errors, s.bytes, s.latency_sum, list(s.buckets))
+                      for route, s in self.routes.items()}
+            statuses = dict(self.statuses)
+            active = self.active_connections
+        lines = [
+            '# HELP presentation_request_duration_seconds Request latency by route.',
+            '# TYPE presentation_request_duration_seconds histogram',
+        ]
+        for route, (count, _, _, latency_sum, buckets) in sorted(routes.items()):
+            label = route.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for upper, bucket in zip(LATENCY_BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'presentation_request_duration_seconds_bucket{{route="{label}",le="{upper}"}} {cumulative}')
+            lines.append(f'presentation_request_duration_seconds_bucket{{route="{label}",le="+Inf"}} {count}')
+            lines.append(f'presentation_request_duration_seconds_sum{{route="{label}"}} {latency_sum:.6f}')
+            lines.append(f'presentation_request_duration_seconds_count{{route="{label}"}} {count}')
+        lines += ['# HELP presentation_response_bytes_total Body bytes served by route.',
+                  '# TYPE presentation_response_bytes_total counter']
+        for route, (_, _, size, _, _) in sorted(routes.items()):
+            label = route.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'presentation_response_bytes_total{{route="{label}"}} {size}')
+        lines += ['# HELP presentation_responses_total Responses by status code.',
+                  '# TYPE presentation_responses_total counter']
+        for status, count in sorted(statuses.items()):
+            lines.append(f'presentation_responses_total{{status="{status}"}} {count}')
+        lines += [
+            '# HELP presentation_cache_hit_ratio Requests served as 304 or from the in-memory cache.',
+            '# TYPE presentation_cache_hit_ratio gauge',
+            f'presentation_cache_hit_ratio {self.cache_hit_ratio(file_cache):.4f}',
+            '# HELP presentation_active_connections Requests currently being handled.',
+            '# TYPE presentation_active_connections gauge',
+            f'presentation_active_connections {active}',
+            '# HELP presentation_live_update_clients Portals subscribed to /events.',
+            '# TYPE presentation_live_update_clients gauge',
+            f'presentation_live_update_clients {live_clients}',
+            '# HELP presentation_uptime_seconds Seconds since the server started.',
+            '# TYPE presentation_uptime_seconds gauge',
+            f'presentation_uptime_seconds {time.time() - self.started:.0f}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, file_cache=None, top=8):
+        """Console summary of the busiest routes"""
+        with self._lock:
+            routes = sorted(self.routes.items(), key=lambda item: item[1].count, reverse=True)[:top]
+            total = sum(self.statuses.values())
+            total_bytes = sum(s.bytes for s in self.routes.values())
+            active = self.active_connections
+            rows = [(route, s.count, s.quantile(0.5), s.quantile(0.95), s.quantile(0.99)) for route, s in routes]
+        uptime = max(time.time() - self.started, 1)
+        lines = [
+            f"📈 {total} requests ({total / uptime:.1f}/s), {total_bytes / 1024 / 1024:.1f} MB served, "
+            f"cache hit {self.cache_hit_ratio(file_cache):.0%}, {active} active connection(s)"
+        ]
+        for route, count, p50, p95, p99 in rows:
+            lines.append(f"   {count:6d}  p50 {p50 * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms  "
+                         f"p99 {p99 * 1000:7.1f}ms  {route}")
+        return '\n'.join(lines)
+
+class DataStore:
+    """training_days.json/recordings.json loaded once and reloaded only when the files change
+
+    Serves the /api/* endpoints: days indexed by number and stats computed server-side,
+    so portals don't download whole files and count in the browser.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self._stamp = None
+        self._state = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """(version, days, days_by_number, recordings, stats), reloading if a file changed"""
+        stamp = self._file_stamp()
+        with self._lock:
+            if self._state is None or stamp != self._stamp:
+                self._state = self._load(stamp)
+                self._stamp = stamp
+            return self._state
+
+    def _file_stamp(self):
+        stamp = []
+        for name in ('training_days.json', 'recordings.json'):
+            try:
+                st = (self.data_dir / name).stat()
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _load(self, stamp):
+        days = self._read_json('training_days.json')
+        recordings = self._read_json('recordings.json')
+        unlocked = sum(1 for d in days if d.get('isUnlocked', False))
+        mtimes = [s[0] for s in stamp if s]
+        last_updated = (datetime.fromtimestamp(max(mtimes) / 1e9, timezone.utc).isoformat().replace('+00:00', 'Z')
+                        if mtimes else None)
+        stats = {
+            'totalDays': len(days),
+            'unlockedDays': unlocked,
+            'lockedDays': len(days) - unlocked,
+            'recordingsAvailable': len(recordings),
+            'lastUpdated': last_updated
+        }
+        version = hashlib.sha1(repr(stamp).encode('utf-8')).hexdigest()[:12]
+        return version, days, {d.get('dayNumber'): d for d in days}, recordings, stats
+
+    def _read_json(self, name):
+        try:
+            with open(self.data_dir / name, 'rb') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    etag_cache = ETagCache()
+    file_cache = FileCache()
+
     def __init__(self, *args, **kwargs):
+        self._cache_control = NO_STORE
+        self._status = None
+        self._body_bytes = 0
+        self._range = None
         super().__init__(*args, directory=str(DIRECTORY), **kwargs)
-    
+
+    def translate_path(self, path):
+        """/recordings/ is served from the configured recordings folder, everything else from the repo"""
+        recordings_dir = getattr(self.server, 'recordings_dir', None)
+        url_path = urlsplit(path).path
+        if recordings_dir and url_path.startswith(RECORDINGS_PREFIX):
+            parts = [p for p in unquote(url_path[len(RECORDINGS_PREFIX):]).split('/')
+                     if p and p not in ('.', '..') and not os.path.dirname(p)]
+            return os.path.join(str(recordings_dir), *parts)
+        return super().translate_path(path)
+
     def end_headers(self):
         # Add CORS headers for local development
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        self.send_header('Cache-Control', self._cache_control)
         super().end_headers()
 
-def main():
+    def setup(self):
+        super().setup()
+        metrics = getattr(self.server, 'metrics', None)
+        if metrics:
+            metrics.connection_opened()
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            metrics = getattr(self.server, 'metrics', None)
+            if metrics:
+                metrics.connection_closed()
+
+    def handle_one_request(self):
+        """Time each request and record it against its route"""
+        start = time.perf_counter()
+        self._status = None
+        self._body_bytes = 0
+        super().handle_one_request()
+        metrics = getattr(self.server, 'metrics', None)
+        if metrics and self._status is not None:
+            metrics.observe(self._route(), self._status, time.perf_counter() - start, self._body_bytes)
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length' and self._status not in (None, 304):
+            self._body_bytes = int(value)
+        super().send_header(keyword, value)
+
+    def _route(self):
+        """Metrics label: the URL path for files and endpoints, collapsed for 404s and day ids"""
+        if self._status == 404:
+            return '<unmatched>'
+        path = urlsplit(getattr(self, 'path', '') or '').path
+        if API_DAY_PATH.match(path):
+            return '/api/days/:n'
+        return path or '<invalid>'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == EVENTS_PATH:
+            self.handle_events()
+            return
+        if path == METRICS_PATH:
+            self.handle_metrics()
+            return
+        super().do_GET()
+
+    def handle_metrics(self):
+        metrics = getattr(self.server, 'metrics', None)
+        if metrics is None:
+            self.send_error(404, "Metrics are disabled")
+            return
+        live_updates = getattr(self.server, 'live_updates', None)
+        body = metrics.render_prometheus(
+            self.file_cache, live_updates.client_count if live_updates else 0
+        ).encode('utf-8')
+        self._cache_control = 'no-store'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_events(self):
+        """Hand this connection to the live-update broadcaster as an SSE stream"""
+        live_updates = getattr(self.server, 'live_updates', None)
+        if live_updates is None:
+            self.send_error(404, "Live updates are disabled")
+            return
+        self._cache_control = 'no-cache'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.detach(self.request)
+        live_updates.add_client(self.request)
+
+    def send_head(self):
+        """Serve files with validators and answer conditional requests with 304"""
+        if self.path.startswith('/api/'):
+            return self.send_api()
+        dev_no_cache = getattr(self.server, 'dev_no_cache', False)
+        if dev_no_cache and 'Range' not in self.headers:
+            return super().send_head()
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or self.path.split('?', 1)[0].endswith('/'):
+            return super().send_head()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()
+
+        self._cache_control = NO_STORE if dev_no_cache else self.cache_policy(self.path)
+        content_type = self.guess_type(path)
+        compressible = is_compressible(content_type)
+        # Byte ranges always refer to the unencoded file, and files too large for the memory cache
+        # are streamed as-is, so decide that before the ETag (and the 304 check) depend on it
+        wants_range = 'Range' in self.headers
+        cacheable = compressible and st.st_size <= self.file_cache.max_entry_bytes
+        encoding = self._negotiate_encoding(st.st_size) if cacheable and not wants_range else 'identity'
+        etag = self.etag_cache.get(path, st)
+        if encoding != 'identity':
+            etag = f'{etag[:-1]}-{encoding}"'
+        last_modified = self.date_time_string(int(st.st_mtime))
+
+        if wants_range and self._range_applies(etag, st.st_mtime):
+            return self.send_range(path, st, content_type, etag, last_modified)
+
+        if not dev_no_cache and self._is_not_modified(etag, st.st_mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            if compressible:
+                self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+
+        try:
+            # Binary assets (images, video) skip the memory cache and go out with sendfile
+            body = self.file_cache.get(path, st, encoding) if cacheable else None
+            if body is None:
+                f = open(path, 'rb')
+                length = st.st_size
+            else:
+                f = io.BytesIO(body)
+                length = len(body)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(length))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        else:
+            self.send_header('Accept-Ranges', 'bytes')
+        if compressible:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return f
+
+    def send_range(self, path, st, content_type, etag, last_modified):
+        """206 with one byte range (sent with sendfile), 416 if it lies past the end of the file"""
+        match = RANGE_HEADER.match(self.headers['Range'].strip())
+        size = st.st_size
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last), size - 1) if last else size - 1
+        else:
+            start, end = max(size - int(last), 0), size - 1
+        if start > end or start >= size:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        self._range = (start, end - start + 1)
+        self.send_response(206)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return f
+
+    def _range_applies(self, etag, mtime):
+        """Single well-formed range whose If-Range (if any) still matches; anything else gets the full file"""
+        match = RANGE_HEADER.match(self.headers['Range'].strip())
+        if not match or match.groups() == ('', ''):
+            return False
+        if_range = self.headers.get('If-Range')
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"'):
+            return if_range == etag
+        try:
+            since = email.utils.parsedate_to_datetime(if_range)
+        except (TypeError, ValueError):
+            return False
+        return since is not None and int(mtime) == int(since.timestamp())
+
+    def send_api(self):
+        """JSON API: /api/days, /api/days/<n>, /api/recordings, /api/stats
+
+        ?fields=a,b limits the keys returned for days/recordings. Responses carry an
+        ETag derived from the data version, so polling clients mostly get 304s.
+        """
+        data_store = getattr(self.server, 'data_store', None)
+        if data_store is None:
+            self.send_error(404, "API is disabled")
+            return None
+
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        version, days, days_by_number, recordings, stats = data_store.snapshot()
+
+        day_match = API_DAY_PATH.match(url.path)
+        if url.path == '/api/days':
+            payload = days
+        elif day_match:
+            payload = days_by_number.get(int(day_match.group(1)))
+            if payload is None:
+                self.send_error(404, "Day not found")
+                return None
+        elif url.path == '/api/recordings':
+            payload = recordings
+        elif url.path == '/api/stats':
+            payload = stats
+        else:
+            self.send_error(404, "Unknown API endpoint")
+            return None
+
+        fields = [f for f in ','.join(query.get('fields', [])).split(',') if f]
+        if fields and url.path != '/api/stats':
+            pick = lambda item: {k: item[k] for k in fields if k in item}
+            payload = [pick(item) for item in payload] if isinstance(payload, list) else pick(payload)
+
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        etag = f'"{version}-{hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:8]}"'
+        self._cache_control = 'no-cache'
+
+        # No Last-Modified is sent for API responses, so only the ETag can validate them
+        if self._is_not_modified(etag, None):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+
+        encoding = self._negotiate_encoding(len(body))
+        if encoding == 'gzip':
+            body = gzip.compress(body, mtime=0)
+        elif encoding == 'br':
+            body = brotli.compress(body)
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def copyfile(self, source, outputfile):
+        """Zero-copy for files on disk; in-memory bodies go through the normal write path"""
+        offset, count = self._range or (0, None)
+        if hasattr(source, 'fileno') and not isinstance(source, io.BytesIO):
+            try:
+                self.connection.sendfile(source, offset, count)
+                return
+            except (AttributeError, OSError, ValueError):
+                pass
+        source.seek(offset)
+        if count is None:
+            super().copyfile(source, outputfile)
+            return
+        while count > 0:
+            block = source.read(min(count, 64 * 1024))
+            if not block:
+                break
+            outputfile.write(block)
+            count -= len(block)
+
+    def _negotiate_encoding(self, size):
+        """Best encoding the client accepts (by server preference), honouring q=0"""
+        if size < MIN_COMPRESS_BYTES:
+            return 'identity'
+        accepted = {}
+        for item in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = item.strip().partition(';')
+            q = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    q = float(params.strip()[2:])
+                except ValueError:
+                    q = 0.0
+            if name:
+                accepted[name.strip().lower()] = q
+        for encoding in SUPPORTED_ENCODINGS:
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return 'identity'
+
+    @staticmethod
+    def cache_policy(url_path):
+        relative = url_path.split('?', 1)[0].lstrip('/')
+        for prefix, policy in CACHE_POLICIES:
+            if relative.startswith(prefix):
+                return policy
+        return DEFAULT_CACHE_POLICY
+
+    def _is_not_modified(self, etag, mtime):
+        """Conditional GET check; mtime None means the response has no Last-Modified to compare against"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+class DetachableServerMixin:
+    """Lets a handler keep its socket open after the request (for long-lived streams)"""
+
+    def detach(self, request):
+        if not hasattr(self, '_detached'):
+            self._detached = set()
+        self._detached.add(request)
+
+    def shutdown_request(self, request):
+        detached = getattr(self, '_detached', set())
+        if request in detached:
+            detached.discard(request)
+            return
+        super().shutdown_request(request)
+
+class SingleThreadedHTTPServer(DetachableServerMixin, socketserver.TCPServer):
+    """One request at a time (the original behaviour)"""
+    allow_reuse_address = True
+
+    def server_close(self):
+        super().server_close()
+        if getattr(self, 'live_updates', None):
+            self.live_updates.stop()
+
+class PooledHTTPServer(DetachableServerMixin, http.server.HTTPServer):
+    """Handles requests on a fixed-size worker pool so a full classroom is served in parallel
+
+    A connection is only accepted once a worker is free, so under load clients wait in the
+    kernel's listen queue (sized by backlog) instead of piling up in memory as accepted sockets.
+    """
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS, backlog=DEFAULT_BACKLOG):
+        # Listen backlog must be set before the socket is activated
+        self.request_queue_size = backlog
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='http-worker')
+        self._free_workers = threading.BoundedSemaphore(workers)
+        super().__init__(server_address, handler_class)
+
+    def get_request(self):
+        self._free_workers.acquire()
+        try:
+            return super().get_request()
+        except BaseException:
+            self._free_workers.release()
+            raise
+
+    def process_request(self, request, client_address):
+        try:
+            self._pool.submit(self._process_request_worker, request, client_address)
+        except BaseException:
+            self._free_workers.release()
+            raise
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._free_workers.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if getattr(self, 'live_updates', None):
+            self.live_updates.stop()
+
+def create_server(host='', port=PORT, mode='threaded', workers=DEFAULT_WORKERS, backlog=DEFAULT_BACKLOG,
+                  handler_class=CustomHTTPRequestHandler, dev_no_cache=False, watch_dir=None,
+                  data_dir=DIRECTORY / 'data', recordings_dir=None):
+    """Build the presentation server for the given serving mode (port 0 picks a free port)
+
+    watch_dir enables the /events live-update stream for the JSON files in that folder;
+    data_dir is what the /api/* endpoints serve; recordings_dir is served at /recordings/.
+    """
+    if mode == 'single':
+        server = SingleThreadedHTTPServer((host, port), handler_class)
+    else:
+        server = PooledHTTPServer((host, port), handler_class, workers=workers, backlog=backlog)
+    # Authoring mode: never let the browser cache anything
+    server.dev_no_cache = dev_no_cache
+    server.metrics = ServerMetrics()
+    server.data_store = DataStore(data_dir) if data_dir else None
+    server.recordings_dir = Path(recordings_dir) if recordings_dir else None
+    server.live_updates = None
+    if watch_dir:
+        server.live_updates = LiveUpdates(watch_dir)
+        server.live_updates.start()
+    return server
+
+def print_stats_periodically(server, interval):
+    last_total = -1
+    while True:
+        time.sleep(interval)
+        # Stay quiet while nobody is connecting
+        if server.metrics.total_requests != last_total:
+            last_total = server.metrics.total_requests
+            print(server.metrics.summary(CustomHTTPRequestHandler.file_cache), flush=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the Power BI training portal locally')
+    parser.add_argument('--port', type=int, default=PORT, help=f'port to listen on (default: {PORT})')
+    parser.add_argument('--bind', default='', help='address to bind (default: all interfaces)')
+    parser.add_argument('--mode', choices=['threaded', 'single'], default='threaded',
+                        help='threaded: worker pool (default); single: one request at a time')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'max concurrent requests in threaded mode (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG,
+                        help=f'pending connection queue size (default: {DEFAULT_BACKLOG})')
+    parser.add_argument('--dev-no-cache', action='store_true',
+                        help='disable HTTP caching (send no-store on everything) while editing content')
+    parser.add_argument('--precompress', action='store_true',
+                        help='compress pages, slides and theme CSS/JS into memory at startup')
+    parser.add_argument('--watch-dir', default=str(DIRECTORY / 'data'),
+                        help='folder with training_days.json/recordings.json, served by /api/* and '
+                             'pushed to open portals via /events when it changes (default: data/)')
+    parser.add_argument('--no-live-updates', action='store_true', help='disable the /events stream')
+    parser.add_argument('--recordings-dir', default=str(DIRECTORY / 'recordings'),
+                        help='folder of local MP4 recordings served at /recordings/ (default: recordings/)')
+    parser.add_argument('--stats-interval', type=int, default=60,
+                        help='seconds between console traffic summaries, 0 to disable (default: 60)')
+    parser.add_argument('--no-browser', action='store_true', help="don't open the portal in a browser")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    port = args.port
+
     print("=" * 60)
     print("🎓 Power BI Training - Presentation Server")
     print("=" * 60)
-    print(f"\n✅ Starting server at http://localhost:{PORT}")
+    print(f"\n✅ Starting server at http://localhost:{port}")
     print(f"📁 Serving from: {DIRECTORY}")
+    if args.mode == 'threaded':
+        print(f"⚙️  Mode: threaded ({args.workers} workers, backlog {args.backlog})")
+    else:
+        print("⚙️  Mode: single-threaded")
+    if args.dev_no_cache:
+        print("🛠️  Caching disabled (--dev-no-cache)")
     print("\n📚 Available URLs:")
-    print(f"   Student Portal: http://localhost:{PORT}/PowerBI_Training_Portal.html")
-    print(f"   Admin Portal:   http://localhost:{PORT}/Admin_Portal.html")
+    print(f"   Student Portal: http://localhost:{port}/PowerBI_Training_Portal.html")
+    print(f"   Admin Portal:   http://localhost:{port}/Admin_Portal.html")
+    print(f"   Stats API:      http://localhost:{port}/api/stats")
+    print(f"   Metrics:        http://localhost:{port}/metrics")
+    if os.path.isdir(args.recordings_dir):
+        print(f"   Recordings:     http://localhost:{port}/recordings/ (from {args.recordings_dir})")
     print("\n💡 Tips for presentation:")
     print("   - Use Python CLI to unlock days: python scripts/admin_fabric.py unlock <day>")
     print("   - Changes sync with Fabric automatically")
-    print("   - Refresh browser to see updates")
+    if args.no_live_updates:
+        print("   - Refresh browser to see updates")
+    else:
+        print("   - Open portals update live when data/*.json changes (e.g. after export)")
     print("\n⚠️  Press Ctrl+C to stop the server")
     print("=" * 60)
-    
+
     # Start server
-    with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
+    watch_dir = None if args.no_live_updates else args.watch_dir
+    with create_server(args.bind, port, args.mode, args.workers, args.backlog,
+                       dev_no_cache=args.dev_no_cache, watch_dir=watch_dir,
+                       data_dir=args.watch_dir, recordings_dir=args.recordings_dir) as httpd:
+        if args.precompress and not args.dev_no_cache:
+            threading.Thread(target=CustomHTTPRequestHandler.file_cache.warm, args=(DIRECTORY,),
+                             daemon=True).start()
+
+        if args.stats_interval > 0:
+            threading.Thread(target=print_stats_periodically, args=(httpd, args.stats_interval),
+                             daemon=True).start()
+
         # Open browser automatically
-        webbrowser.open(f'http://localhost:{PORT}/PowerBI_Training_Portal.html')
-        
+        if not args.no_browser:
+            webbrowser.open(f'http://localhost:{port}/PowerBI_Training_Portal.html')
+
         try:
             httpd.serve_forever()
         except KeyboardInterrupt: